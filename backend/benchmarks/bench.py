@@ -0,0 +1,281 @@
+"""End-to-end API benchmark.
+
+Boots ``main:app`` in-process against a local database, seeds it and drives
+each router at the requested concurrency levels. Results are printed as a
+table and written to JSON so runs can be compared between commits::
+
+    python benchmarks/bench.py --employees 100000 --output results/head.json
+    python benchmarks/bench.py --compare results/base.json --output results/head.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the Employee Management API")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench.sqlite3",
+                        help="Database to seed and benchmark against")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--attendance-days", type=int, default=30)
+    parser.add_argument("--payroll-months", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated dataset")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--concurrency", default="1,10,50",
+                        help="Comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and level")
+    parser.add_argument("--endpoints", default="", help="Comma separated subset of endpoints to run")
+    parser.add_argument("--output", default="", help="Write results to this JSON file")
+    parser.add_argument("--compare", default="", help="Compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative p95 slowdown reported as a regression")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Settings are read at import time, so configure them before importing the app
+os.environ["DATABASE_URL"] = args.database_url
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123456789")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+# Logins are driven far past the production limits on purpose
+os.environ.setdefault("LOGIN_RATE_LIMIT_ENABLED", "false")
+
+import httpx
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+from main import app
+from db.main import async_engine
+from datagen import DatasetConfig, generate
+
+PREFIX = "/api/v1"
+
+BENCH_USERNAME = "bench_admin"
+BENCH_PASSWORD = "bench_password"
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_):
+        self.count += 1
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the process's peak RSS so the next reading covers one endpoint run.
+    Only Linux allows this; elsewhere the peak stays cumulative for the process.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_endpoints(employees: int, attendance_days: int, token_holder: dict):
+    rng = random.Random(7)
+    # The generator only records attendance on weekdays, counting back from its anchor date
+    days, day = [], DatasetConfig().anchor_date
+    while len(days) < max(attendance_days, 1):
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+        day -= timedelta(days=1)
+
+    def auth():
+        return {"Authorization": f"Bearer {token_holder['token']}"}
+
+    return {
+        "auth_login": lambda: ("POST", f"{PREFIX}/auth/login", {
+            "json": {"username": BENCH_USERNAME, "password": BENCH_PASSWORD}
+        }),
+        "employee_list": lambda: ("GET", f"{PREFIX}/employee/", {
+            "params": {"limit": 50}, "headers": auth()
+        }),
+        "employee_detail": lambda: ("GET", f"{PREFIX}/employee/{rng.randint(1, employees)}", {
+            "headers": auth()
+        }),
+        "contract_list": lambda: ("GET", f"{PREFIX}/employee/contracts/", {
+            "params": {"limit": 50}, "headers": auth()
+        }),
+        "payroll_list": lambda: ("GET", f"{PREFIX}/payroll/", {
+            "params": {"limit": 50}, "headers": auth()
+        }),
+        "attendance_by_date": lambda: ("GET", f"{PREFIX}/attendance/", {
+            "params": {"date": rng.choice(days)},
+            "headers": auth(),
+        }),
+        "employee_count": lambda: ("GET", f"{PREFIX}/employee/count/", {"headers": auth()}),
+        "department_count": lambda: ("GET", f"{PREFIX}/department/count/", {"headers": auth()}),
+        "position_list": lambda: ("GET", f"{PREFIX}/position/", {"headers": auth()}),
+    }
+
+
+async def run_endpoint(client, make_request, concurrency: int, total: int, counter: QueryCounter) -> dict:
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, url, kwargs = make_request()
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries_before = counter.count
+    per_endpoint = reset_peak_rss()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "queries_per_request": (counter.count - queries_before) / total,
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_rss_scope": "endpoint" if per_endpoint else "process",
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> int:
+    with open(baseline_path) as f:
+        baseline = {(r["endpoint"], r["concurrency"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"\nComparison with {baseline_path} (p95, threshold {threshold:.0%})")
+    for result in results:
+        before = baseline.get((result["endpoint"], result["concurrency"]))
+        if before is None or not before["p95_ms"]:
+            continue
+        change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"]
+        flag = "REGRESSION" if change > threshold else ""
+        regressions += bool(flag)
+        print(f"  {result['endpoint']:<20} c={result['concurrency']:<4} "
+              f"{before['p95_ms']:9.2f} -> {result['p95_ms']:9.2f} ms ({change:+.1%}) {flag}")
+    return regressions
+
+
+async def main() -> int:
+    counter = QueryCounter(async_engine)
+
+    dataset = None
+    if not args.skip_seed:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+        started = time.perf_counter()
+        dataset = await generate(async_engine, DatasetConfig(
+            seed=args.seed,
+            employees=args.employees,
+            attendance_days=args.attendance_days,
+            workpoint_days=0,
+            payroll_months=args.payroll_months,
+            admin_username=BENCH_USERNAME,
+            admin_password=BENCH_PASSWORD,
+        ))
+        print(f"Seeded {dataset} in {time.perf_counter() - started:.1f}s")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        login = await client.post(f"{PREFIX}/auth/login", json={
+            "username": BENCH_USERNAME, "password": BENCH_PASSWORD
+        })
+        login.raise_for_status()
+        token_holder = {"token": login.json()["access_token"]}
+
+        endpoints = build_endpoints(args.employees, args.attendance_days, token_holder)
+        selected = [e for e in args.endpoints.split(",") if e] or list(endpoints)
+        levels = [int(c) for c in args.concurrency.split(",")]
+
+        results = []
+        print(f"{'endpoint':<20} {'conc':>5} {'p50':>9} {'p95':>9} {'p99':>9} "
+              f"{'rps':>9} {'q/req':>6} {'rss MB':>8} {'err':>4}")
+        for name in selected:
+            for level in levels:
+                result = await run_endpoint(client, endpoints[name], level, args.requests, counter)
+                result.update({"endpoint": name, "concurrency": level})
+                results.append(result)
+                print(f"{name:<20} {level:>5} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                      f"{result['p99_ms']:>9.2f} {result['throughput_rps']:>9.1f} "
+                      f"{result['queries_per_request']:>6.1f} {result['peak_rss_mb']:>8.1f}"
+                      f"{'' if result['peak_rss_scope'] == 'endpoint' else '*'} "
+                      f"{result['errors']:>4}")
+        if any(result["peak_rss_scope"] == "process" for result in results):
+            print("* peak RSS of the whole process so far; this platform cannot reset it per endpoint")
+
+    await async_engine.dispose()
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "commit": git_commit(),
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "database": async_engine.dialect.name,
+                    "dataset": dataset or "existing",
+                    "requests": args.requests,
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,150 @@
+"""Login burst benchmark.
+
+Measures a non-auth endpoint on its own, then again while a burst of logins
+runs against the same worker. With password hashing off the event loop the
+probe latency should stay roughly flat::
+
+    python benchmarks/login_burst.py --logins 200 --login-concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark API latency during a login burst")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench.sqlite3",
+                        help="Database to seed and benchmark against")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--logins", type=int, default=200, help="Logins in the burst")
+    parser.add_argument("--login-concurrency", type=int, default=50)
+    parser.add_argument("--probe-path", default="/api/v1/position/",
+                        help="Non-auth endpoint sampled during the burst")
+    parser.add_argument("--probe-interval", type=float, default=0.01,
+                        help="Seconds between probe requests")
+    parser.add_argument("--threshold", type=float, default=2.0,
+                        help="Fail when burst p95 exceeds baseline p95 by this factor")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+os.environ["DATABASE_URL"] = args.database_url
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123456789")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+# Logins are driven far past the production limits on purpose
+os.environ.setdefault("LOGIN_RATE_LIMIT_ENABLED", "false")
+
+import httpx
+from sqlmodel import SQLModel
+
+from main import app
+from db.main import async_engine
+from datagen import DatasetConfig, generate
+
+PREFIX = "/api/v1"
+
+BENCH_USERNAME = "bench_admin"
+BENCH_PASSWORD = "bench_password"
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summary(latencies) -> str:
+    return (f"n={len(latencies):<5} p50={percentile(latencies, 50) * 1000:8.2f} ms "
+            f"p95={percentile(latencies, 95) * 1000:8.2f} ms "
+            f"max={max(latencies) * 1000:8.2f} ms")
+
+
+async def probe(client, headers: dict, stop: asyncio.Event) -> list:
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(args.probe_path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        await asyncio.sleep(args.probe_interval)
+    return latencies
+
+
+async def login_burst(client) -> tuple:
+    latencies = []
+    errors = 0
+    remaining = iter(range(args.logins))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.post(f"{PREFIX}/auth/login", json={
+                "username": BENCH_USERNAME, "password": BENCH_PASSWORD
+            })
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.login_concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def main() -> int:
+    if not args.skip_seed:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+        await generate(async_engine, DatasetConfig(
+            employees=100,
+            attendance_days=0,
+            workpoint_days=0,
+            payroll_months=0,
+            admin_username=BENCH_USERNAME,
+            admin_password=BENCH_PASSWORD,
+        ))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=60) as client:
+        login = await client.post(f"{PREFIX}/auth/login", json={
+            "username": BENCH_USERNAME, "password": BENCH_PASSWORD
+        })
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        # Baseline: probe alone for about as long as the burst will take
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, headers, stop))
+        await asyncio.sleep(2)
+        stop.set()
+        baseline = await baseline_task
+
+        stop = asyncio.Event()
+        burst_probe = asyncio.create_task(probe(client, headers, stop))
+        logins, errors, elapsed = await login_burst(client)
+        stop.set()
+        during = await burst_probe
+
+    await async_engine.dispose()
+
+    print(f"probe {args.probe_path}")
+    print(f"  baseline     {summary(baseline)}")
+    print(f"  during burst {summary(during)}")
+    print(f"logins {summary(logins)} errors={errors} "
+          f"throughput={len(logins) / elapsed:.1f}/s mean={statistics.fmean(logins) * 1000:.1f} ms")
+
+    ratio = percentile(during, 95) / percentile(baseline, 95)
+    print(f"probe p95 ratio during burst: {ratio:.2f}x (threshold {args.threshold:.2f}x)")
+    return 1 if ratio > args.threshold else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,32 @@
+"""add stat counters
+
+Revision ID: 2d9c7e5a1f08
+Revises: 8f4a1d6c2b90
+Create Date: 2026-10-18 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '2d9c7e5a1f08'
+down_revision: Union[str, None] = '8f4a1d6c2b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the reconciliation the app runs at startup
+    op.create_table('stat_counters',
+    sa.Column('metric', mysql.VARCHAR(length=32), nullable=False),
+    sa.Column('key', mysql.VARCHAR(length=64), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('metric', 'key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stat_counters')
@@ -0,0 +1,56 @@
+"""drop id_number from search_text
+
+Revision ID: 3e8b5f0a7c12
+Revises: 7c3e9b1d5a24
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.db.models import EMPLOYEE_SEARCH_FIELDS, employee_search_values
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b5f0a7c12'
+down_revision: Union[str, None] = '7c3e9b1d5a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    # ID numbers are matched exactly, and only for roles that may see them
+    op.create_index('ix_employees_id_number', 'employees', ['id_number'], unique=False)
+
+    # Rebuild search_text without id_number so other roles cannot find employees by it
+    employees = sa.table(
+        'employees',
+        sa.column('id'),
+        sa.column('search_name'),
+        sa.column('search_text'),
+        *(sa.column(field) for field in EMPLOYEE_SEARCH_FIELDS),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(employees.c.id, *(employees.c[field] for field in EMPLOYEE_SEARCH_FIELDS))
+            .where(employees.c.id > last_id)
+            .order_by(employees.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        conn.execute(
+            employees.update().where(employees.c.id == sa.bindparam('row_id')),
+            [{'row_id': row['id'], **employee_search_values(row)} for row in rows],
+        )
+        last_id = rows[-1]['id']
+
+
+def downgrade() -> None:
+    # search_text is left without id_number; it was never returned to the client
+    op.drop_index('ix_employees_id_number', table_name='employees')
@@ -0,0 +1,66 @@
+"""add employee search columns
+
+Revision ID: 5b7e2c9d41f3
+Revises: c311438b9211
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from src.db.models import EMPLOYEE_SEARCH_FIELDS, employee_search_values
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d41f3'
+down_revision: Union[str, None] = 'c311438b9211'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column('employees', sa.Column('search_name', mysql.VARCHAR(length=50), nullable=True))
+    op.add_column('employees', sa.Column('search_text', mysql.VARCHAR(length=255), nullable=True))
+
+    # Folding happens in Python so existing rows match what the ORM writes
+    employees = sa.table(
+        'employees',
+        sa.column('id'),
+        sa.column('search_name'),
+        sa.column('search_text'),
+        *(sa.column(field) for field in EMPLOYEE_SEARCH_FIELDS),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(employees.c.id, *(employees.c[field] for field in EMPLOYEE_SEARCH_FIELDS))
+            .where(employees.c.id > last_id)
+            .order_by(employees.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        conn.execute(
+            employees.update().where(employees.c.id == sa.bindparam('row_id')),
+            [{'row_id': row['id'], **employee_search_values(row)} for row in rows],
+        )
+        last_id = rows[-1]['id']
+
+    # Built after the backfill so the FULLTEXT index is written once
+    op.create_index(op.f('ix_employees_search_name'), 'employees', ['search_name'], unique=False)
+    op.create_index(
+        'ix_employees_search_text', 'employees', ['search_text'],
+        mysql_prefix='FULLTEXT', mysql_with_parser='ngram'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_employees_search_text', table_name='employees')
+    op.drop_index(op.f('ix_employees_search_name'), table_name='employees')
+    op.drop_column('employees', 'search_text')
+    op.drop_column('employees', 'search_name')
@@ -0,0 +1,33 @@
+"""add row versions
+
+Revision ID: 7c3e9b1d5a24
+Revises: 2d9c7e5a1f08
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9b1d5a24'
+down_revision: Union[str, None] = '2d9c7e5a1f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['departments', 'positions', 'employees', 'contracts', 'payrolls']
+
+
+def upgrade() -> None:
+    # Existing rows start at version 1; the app writes timestamp versions from then on
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.BigInteger(), nullable=False, server_default='1'))
+        op.create_index(f'ix_{table}_version', table, ['version'], unique=False)
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_version', table_name=table)
+        op.drop_column(table, 'version')
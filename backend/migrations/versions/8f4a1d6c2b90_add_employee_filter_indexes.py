@@ -0,0 +1,36 @@
+"""add employee filter indexes
+
+Revision ID: 8f4a1d6c2b90
+Revises: 5b7e2c9d41f3
+Create Date: 2026-10-18 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4a1d6c2b90'
+down_revision: Union[str, None] = '5b7e2c9d41f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_employees_department_position', ['department_id', 'position_id']),
+    ('ix_employees_department_salary', ['department_id', 'salary']),
+    ('ix_employees_position_salary', ['position_id', 'salary']),
+    ('ix_employees_gender_marital_status', ['gender', 'marital_status']),
+    ('ix_employees_salary', ['salary']),
+    ('ix_employees_birth_date', ['birth_date']),
+]
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, 'employees', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='employees')
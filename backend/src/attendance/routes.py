@@ -4,6 +4,7 @@ from typing import List
 from datetime import date
 
 from db.main import get_session
+from db.replica import get_read_session
 from auth.dependencies import AccessTokenBearer, RoleChecker
 from attendance.schemas import AttendanceCreate, AttendanceResponse
 from attendance.service import AttendanceService
@@ -25,7 +26,7 @@ async def create_attendance(
 @attendance_router.get("/", response_model=List[AttendanceResponse])
 async def get_attendance(
     date: date,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _: dict = Depends(access_token_bearer),
 ):
     """Get attendance records for a specific date"""
@@ -3,11 +3,14 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 from datetime import datetime, date
 from fastapi import HTTPException, status
+import logging
 
 from db.models import Attendance, Employee, Department
 from attendance.schemas import AttendanceCreate, AttendanceUpdate
 from errors import AttendanceNotFound, EmployeeNotFound
 
+logger = logging.getLogger(__name__)
+
 class AttendanceService:
     async def create_or_update_attendance(
         self, attendance_data: AttendanceCreate, session: AsyncSession
@@ -52,7 +55,7 @@ class AttendanceService:
             }
 
         except Exception as e:
-            print(f"Error creating/updating attendance: {str(e)}")
+            logger.exception("Error creating/updating attendance")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create/update attendance record"
@@ -90,7 +93,7 @@ class AttendanceService:
             return attendance_records
 
         except Exception as e:
-            print(f"Error getting attendance: {str(e)}")
+            logger.exception("Error getting attendance")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to fetch attendance records"
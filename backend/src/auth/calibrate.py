@@ -0,0 +1,84 @@
+"""Measure password hashing cost on this host and suggest settings.
+
+Run from ``backend/src`` on the machine that will serve logins::
+
+    python -m auth.calibrate --target-ms 250
+    python -m auth.calibrate --scheme argon2 --target-ms 250
+"""
+import argparse
+import statistics
+import time
+
+from auth.utils import build_password_context
+
+BCRYPT_ROUNDS = range(8, 17)
+ARGON2_TIME_COSTS = range(1, 11)
+
+
+def measure(context, samples: int) -> float:
+    """Median seconds to hash one password"""
+    context.hash("calibration")  # load the backend outside the timing
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target: float, samples: int) -> dict:
+    best = None
+    for rounds in BCRYPT_ROUNDS:
+        elapsed = measure(build_password_context("bcrypt", bcrypt_rounds=rounds), samples)
+        print(f"  bcrypt rounds={rounds:<3} {elapsed * 1000:8.1f} ms")
+        if elapsed > target:
+            break
+        best = rounds
+    return {"PASSWORD_HASH_SCHEME": "bcrypt", "BCRYPT_ROUNDS": best or BCRYPT_ROUNDS[0]}
+
+
+def calibrate_argon2(target: float, samples: int, memory_cost: int, parallelism: int) -> dict:
+    best = None
+    for time_cost in ARGON2_TIME_COSTS:
+        context = build_password_context(
+            "argon2",
+            argon2_time_cost=time_cost,
+            argon2_memory_cost=memory_cost,
+            argon2_parallelism=parallelism,
+        )
+        elapsed = measure(context, samples)
+        print(f"  argon2id t={time_cost:<3} m={memory_cost} p={parallelism} {elapsed * 1000:8.1f} ms")
+        if elapsed > target:
+            break
+        best = time_cost
+    return {
+        "PASSWORD_HASH_SCHEME": "argon2",
+        "ARGON2_TIME_COST": best or ARGON2_TIME_COSTS[0],
+        "ARGON2_MEMORY_COST": memory_cost,
+        "ARGON2_PARALLELISM": parallelism,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m auth.calibrate", description=__doc__.splitlines()[0])
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250, help="Acceptable time per hash")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes timed per setting")
+    parser.add_argument("--memory-cost", type=int, default=65536, help="argon2 memory in KiB")
+    parser.add_argument("--parallelism", type=int, default=4, help="argon2 lanes")
+    args = parser.parse_args()
+
+    target = args.target_ms / 1000
+    print(f"Calibrating {args.scheme} for {args.target_ms:.0f} ms per hash")
+    if args.scheme == "bcrypt":
+        suggested = calibrate_bcrypt(target, args.samples)
+    else:
+        suggested = calibrate_argon2(target, args.samples, args.memory_cost, args.parallelism)
+
+    print("\nSuggested settings:")
+    for name, value in suggested.items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from db.main import get_session
 from db.models import User
 from .service import UserService
 from .utils import decode_token
+from .revocation import revocation_list
 from errors.auth_errors import RefreshTokenRequired
 
 user_service = UserService()
@@ -20,12 +21,13 @@ class TokenBearer:
 
     async def __call__(
         self,
+        request: Request,
         credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer())
     ) -> dict:
         """Base token validation"""
         try:
             token = credentials.credentials
-            token_data = decode_token(token)
+            token_data = await self.get_token_data(request, token)
             
             if not token_data:
                 raise HTTPException(
@@ -39,6 +41,8 @@ class TokenBearer:
             
             return token_data
             
+        except HTTPException:
+            raise
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,6 +63,26 @@ class TokenBearer:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+    @staticmethod
+    async def get_token_data(request: Request, token: str) -> dict:
+        """
+        Decode the token and check revocation once per request; every bearer
+        instance used by the same request shares the result through request.state
+        """
+        cached = getattr(request.state, "token_claims", None)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+
+        token_data = decode_token(token)
+        if await revocation_list.is_revoked(token_data.get("jti", "")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        request.state.token_claims = (token, token_data)
+        return token_data
+
     def verify_token_data(self, token_data: dict) -> None:
         """Override in child classes for specific token validation"""
         pass
@@ -79,8 +103,10 @@ class RefreshTokenBearer(TokenBearer):
         if not token_data.get("refresh"):
             raise RefreshTokenRequired()
 
+access_token_bearer = AccessTokenBearer()
+
 async def get_current_user(
-    token_data: dict = Depends(AccessTokenBearer()),
+    token_data: dict = Depends(access_token_bearer),
     session: AsyncSession = Depends(get_session),
 ) -> User:
     """Get current user from token data"""
@@ -94,7 +120,7 @@ async def get_current_user(
                 detail="Invalid token data",
             )
             
-        user = await user_service.get_user_by_username(username, session)
+        user = await user_service.get_cached_user_by_username(username, session)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -114,7 +140,7 @@ class RoleChecker:
     def __init__(self, allowed_roles: list):
         self.allowed_roles = allowed_roles
 
-    def __call__(self, token_data: dict = Depends(AccessTokenBearer())) -> bool:
+    async def __call__(self, token_data: dict = Depends(access_token_bearer)) -> bool:
         """Check if user has required role"""
         try:
             user = token_data.get("user", {})
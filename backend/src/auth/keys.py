@@ -0,0 +1,144 @@
+"""Signing keys for asymmetric JWTs.
+
+Keys live in ``JWT_KEYS_DIR``, one PEM file per key named after its ``kid``:
+``<kid>.pem`` holds a private key that can sign, ``<kid>.pub.pem`` a public key
+kept only so tokens signed before a rotation still verify. Generate a new key
+from ``backend/src`` with::
+
+    python -m auth.keys --algorithm RS256
+"""
+import argparse
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "EdDSA"}
+
+# Don't rescan the key directory more often than this for an unknown kid
+RELOAD_INTERVAL = 30
+
+
+def is_asymmetric(algorithm: str) -> bool:
+    return algorithm in ASYMMETRIC_ALGORITHMS
+
+
+class KeyStore:
+    """Parsed signing and verification keys, loaded once and cached by kid"""
+
+    def __init__(self, keys_dir: str, algorithm: str, active_kid: Optional[str] = None):
+        self.keys_dir = keys_dir
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self._private_keys: Dict[str, object] = {}
+        self._public_keys: Dict[str, object] = {}
+        self._loaded_at = 0.0
+
+    def load(self) -> None:
+        from cryptography.hazmat.primitives.serialization import (
+            load_pem_private_key,
+            load_pem_public_key,
+        )
+
+        private_keys, public_keys = {}, {}
+        for name in sorted(os.listdir(self.keys_dir)):
+            path = os.path.join(self.keys_dir, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            if name.endswith(".pub.pem"):
+                public_keys[name[:-len(".pub.pem")]] = load_pem_public_key(data)
+            elif name.endswith(".pem"):
+                kid = name[:-len(".pem")]
+                private_keys[kid] = load_pem_private_key(data, password=None)
+                public_keys[kid] = private_keys[kid].public_key()
+
+        self._private_keys = private_keys
+        self._public_keys = public_keys
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(public_keys)} JWT keys from {self.keys_dir}")
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded_at:
+            self.load()
+
+    def signing_key(self) -> Tuple[str, object]:
+        """The kid and private key new tokens are signed with"""
+        self._ensure_loaded()
+        if not self._private_keys:
+            raise RuntimeError(f"No private JWT keys found in {self.keys_dir}")
+        # Key ids sort by creation time, so the newest key signs unless one is pinned
+        kid = self.active_kid or max(self._private_keys)
+        if kid not in self._private_keys:
+            raise RuntimeError(f"JWT_ACTIVE_KID {kid} has no private key in {self.keys_dir}")
+        return kid, self._private_keys[kid]
+
+    def verification_key(self, kid: str) -> Optional[object]:
+        self._ensure_loaded()
+        key = self._public_keys.get(kid)
+        if key is None and time.monotonic() - self._loaded_at >= RELOAD_INTERVAL:
+            # Another instance may have rotated in a key this one hasn't seen yet
+            self.load()
+            key = self._public_keys.get(kid)
+        return key
+
+    def jwks(self) -> dict:
+        """Public keys in JSON Web Key Set form"""
+        self._ensure_loaded()
+        keys = []
+        for kid, public_key in self._public_keys.items():
+            converter = OKPAlgorithm if self.algorithm == "EdDSA" else RSAAlgorithm
+            jwk = converter.to_jwk(public_key, as_dict=True)
+            jwk.update({"kid": kid, "alg": self.algorithm, "use": "sig"})
+            keys.append(jwk)
+        return {"keys": keys}
+
+
+key_store: Optional[KeyStore] = (
+    KeyStore(settings.JWT_KEYS_DIR, settings.JWT_ALGORITHM, settings.JWT_ACTIVE_KID)
+    if is_asymmetric(settings.JWT_ALGORITHM) else None
+)
+
+
+def generate_key(algorithm: str, keys_dir: str) -> str:
+    """Write a new private key to ``keys_dir`` and return its kid"""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    kid = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    os.makedirs(keys_dir, exist_ok=True)
+    path = os.path.join(keys_dir, f"{kid}.pem")
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as f:
+        f.write(private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ))
+    return kid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m auth.keys", description="Generate a JWT signing key")
+    parser.add_argument("--algorithm", choices=sorted(ASYMMETRIC_ALGORITHMS), default=settings.JWT_ALGORITHM
+                        if is_asymmetric(settings.JWT_ALGORITHM) else "RS256")
+    parser.add_argument("--keys-dir", default=settings.JWT_KEYS_DIR)
+    args = parser.parse_args()
+
+    kid = generate_key(args.algorithm, args.keys_dir)
+    print(f"Generated {args.algorithm} key {kid} in {args.keys_dir}")
+    print("It signs new tokens once the API restarts, unless JWT_ACTIVE_KID pins another key.")
+
+
+if __name__ == "__main__":
+    main()
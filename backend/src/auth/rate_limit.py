@@ -0,0 +1,114 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+import redis.asyncio as aioredis
+
+from config import settings
+from db.redis import token_blocklists
+from errors.auth_errors import LoginRateLimited
+from metrics import RATE_LIMIT_HITS, REDIS_COMMAND_DURATION, observe_duration
+
+logger = logging.getLogger(__name__)
+
+# Refill then take one token atomically. Uses the server clock so every
+# worker agrees on elapsed time. Returns {allowed, milliseconds until a token}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate))
+return {allowed, retry_after}
+"""
+
+# How long to stay on the local limiter after Redis fails
+REDIS_RETRY_INTERVAL = 10
+
+
+class LocalTokenBucket:
+    """In-process token buckets, used while Redis is unavailable"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, capacity: int, rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - ts) * rate)
+
+        if tokens >= 1:
+            allowed, retry_after = True, 0.0
+            tokens -= 1
+        else:
+            allowed, retry_after = False, (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+class LoginRateLimiter:
+    """Per-username and per-IP token buckets for login attempts"""
+
+    def __init__(self, redis: aioredis.Redis = None):
+        self.redis = redis or token_blocklists
+        self.local = LocalTokenBucket()
+        self._script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self._redis_down_until = 0.0
+
+    async def _take(self, key: str, capacity: int, per_minute: int) -> Tuple[bool, float]:
+        rate = per_minute / 60
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                with observe_duration(REDIS_COMMAND_DURATION, "evalsha"):
+                    allowed, retry_after_ms = await self._script(keys=[key], args=[capacity, rate])
+                return bool(allowed), retry_after_ms / 1000
+            except Exception as e:
+                logger.warning(f"Rate limit store unavailable, limiting locally: {str(e)}")
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+        return self.local.take(key, capacity, rate)
+
+    async def check(self, username: str, ip: str) -> None:
+        """Take one attempt from both buckets or raise LoginRateLimited"""
+        if not settings.LOGIN_RATE_LIMIT_ENABLED:
+            return
+
+        limits = (
+            ("ip", ip, settings.LOGIN_RATE_IP_BURST, settings.LOGIN_RATE_IP_PER_MINUTE),
+            ("username", username.lower(), settings.LOGIN_RATE_USERNAME_BURST,
+             settings.LOGIN_RATE_USERNAME_PER_MINUTE),
+        )
+        for scope, value, capacity, per_minute in limits:
+            allowed, retry_after = await self._take(f"ratelimit:login:{scope}:{value}", capacity, per_minute)
+            if not allowed:
+                RATE_LIMIT_HITS.inc(scope)
+                raise LoginRateLimited(max(1, math.ceil(retry_after)))
+
+
+login_rate_limiter = LoginRateLimiter()
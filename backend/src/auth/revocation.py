@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from config import settings
+from db.redis import REVOKED_PREFIX, add_token_to_blocklist, is_token_revoked, token_blocklists
+from metrics import REDIS_COMMAND_DURATION, REVOCATION_CHECKS, observe_duration
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "token-revocations"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, sized for a capacity and error rate"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing: two 64-bit halves of one digest give every probe position
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """
+    Per-worker view of revoked token ids. A local Bloom filter answers the
+    common "not revoked" case without a network call; Redis is only asked
+    when the filter reports a possible hit. Revocations from other workers
+    arrive over Redis pub/sub, and the filter is rebuilt from Redis
+    periodically so expired entries drop out.
+    """
+
+    def __init__(self, redis: aioredis.Redis = None):
+        self.redis = redis or token_blocklists
+        self.bloom = self._new_filter()
+        self._added_during_rebuild: Optional[list] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _new_filter() -> BloomFilter:
+        return BloomFilter(settings.REVOCATION_FILTER_CAPACITY, settings.REVOCATION_FILTER_ERROR_RATE)
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke a token until its own expiry"""
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            return
+        self._add(jti)
+        try:
+            await add_token_to_blocklist(jti, ttl, client=self.redis)
+            with observe_duration(REDIS_COMMAND_DURATION, "publish"):
+                await self.redis.publish(REVOCATION_CHANNEL, jti)
+        except Exception as e:
+            # Still rejected by this worker: its filter hit fails closed while Redis is down
+            logger.error(f"Could not publish token revocation: {str(e)}")
+
+    async def is_revoked(self, jti: str) -> bool:
+        if jti not in self.bloom:
+            REVOCATION_CHECKS.inc("filter_miss")
+            return False
+
+        try:
+            revoked = await is_token_revoked(jti, client=self.redis)
+        except Exception as e:
+            # The filter has no false negatives, so a hit is most likely a real revocation
+            logger.warning(f"Revocation lookup failed, rejecting token: {str(e)}")
+            REVOCATION_CHECKS.inc("redis_error")
+            return True
+
+        REVOCATION_CHECKS.inc("revoked" if revoked else "false_positive")
+        return revoked
+
+    def _add(self, jti: str) -> None:
+        self.bloom.add(jti)
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.append(jti)
+
+    async def rebuild(self) -> None:
+        """Replace the filter with the ids currently revoked in Redis"""
+        bloom = self._new_filter()
+        self._added_during_rebuild = []
+        try:
+            with observe_duration(REDIS_COMMAND_DURATION, "scan"):
+                async for key in self.redis.scan_iter(match=f"{REVOKED_PREFIX}*", count=1000):
+                    bloom.add(key.decode()[len(REVOKED_PREFIX):])
+            for jti in self._added_during_rebuild:
+                bloom.add(jti)
+            self.bloom = bloom
+        finally:
+            self._added_during_rebuild = None
+        logger.info(f"Loaded {bloom.count} revoked tokens")
+
+    async def _consume(self, pubsub) -> None:
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                self._add(message["data"].decode())
+
+    async def _run(self) -> None:
+        delay = 1
+        while True:
+            try:
+                # Subscribe before scanning so no revocation falls between the two
+                pubsub = self.redis.pubsub()
+                try:
+                    await pubsub.subscribe(REVOCATION_CHANNEL)
+                    await self.rebuild()
+                    delay = 1
+                    await asyncio.wait_for(self._consume(pubsub), settings.REVOCATION_REBUILD_INTERVAL)
+                finally:
+                    await pubsub.aclose()
+            except asyncio.TimeoutError:
+                continue
+            except Exception as e:
+                logger.warning(f"Revocation sync unavailable, retrying in {delay}s: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60)
+
+    def start(self) -> None:
+        """Keep the filter in sync with Redis in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+revocation_list = RevocationList()
@@ -1,6 +1,10 @@
 from datetime import datetime, timedelta
+from typing import Optional
+import logging
 
-from fastapi import APIRouter, Depends, status, BackgroundTasks
+import jwt
+
+from fastapi import APIRouter, Depends, Request, status, BackgroundTasks
 from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -8,24 +12,35 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from auth.service import UserService
 from auth.utils import (
     create_access_token, 
-    verify_password, 
+    verify_password_async,
+    verify_and_update_password_async,
     create_url_safe_token, 
     decode_url_safe_token,
-    generate_password_hash
+    generate_password_hash_async,
+    decode_token
 )
-from auth.schemas import UserCreateModel, LoginModel, MailModel
+from auth.schemas import UserCreateModel, LoginModel, LogoutModel, MailModel
 from db.main import get_session
+from db.pagination import PageParams
+from metrics import LOGIN_ATTEMPTS
 from errors.auth_errors import InvalidCredentials, UserAlreadyExists, UserNotFound, InvalidToken
 from .dependencies import RefreshTokenBearer, AccessTokenBearer, RoleChecker
+from .keys import key_store
+from .revocation import revocation_list
+from .rate_limit import login_rate_limiter
 from config import settings
 
 auth_router = APIRouter()
+well_known_router = APIRouter()
 user_service = UserService()
 role_checker = Depends(RoleChecker(["admin"]))
 access_token_bearer = AccessTokenBearer()
+refresh_token_bearer = RefreshTokenBearer()
 
 REFRESH_TOKEN_EXPIRY = 2
 
+logger = logging.getLogger(__name__)
+
 
 @auth_router.post("/signup", status_code=status.HTTP_201_CREATED)
 async def create_user_account(
@@ -34,7 +49,6 @@ async def create_user_account(
     session: AsyncSession = Depends(get_session),
 ):
     """Create a new user account"""
-    print('session', session)
     username = user_data.username
     user_exists = await user_service.get_user_by_username(username, session)
 
@@ -61,17 +75,27 @@ async def create_user_account(
 @auth_router.post("/login", status_code=status.HTTP_200_OK)
 async def login(
     login_data: LoginModel,
+    request: Request,
     session: AsyncSession = Depends(get_session),
 ):
     username = login_data.username
     password = login_data.password
+
+    # Reject throttled attempts before any database or hashing work
+    await login_rate_limiter.check(username, request.client.host if request.client else "unknown")
     
     user = await user_service.get_user_by_username(username, session)
+    # Hand the connection back to the pool before waiting on the hashing pool
+    await session.close()
 
     if user is not None:
-        password_valid = verify_password(password, user.password_hash)
+        password_valid, new_hash = await verify_and_update_password_async(password, user.password_hash)
 
         if password_valid:
+            if new_hash:
+                # Upgrade hashes made with an older scheme or cost
+                await user_service.update_password(user.uid, new_hash, session)
+
             access_token = create_access_token(
                 user_data={
                     "username": user.username,
@@ -90,6 +114,7 @@ async def login(
                 expiry=timedelta(days=REFRESH_TOKEN_EXPIRY)
             )
 
+            LOGIN_ATTEMPTS.inc("success")
             return JSONResponse(
                 content={
                     "message": "Login successful",
@@ -98,6 +123,9 @@ async def login(
                     "user": {"username": user.username, "uid": user.uid, "role": user.role}
                 },
             )
+        LOGIN_ATTEMPTS.inc("invalid_password")
+    else:
+        LOGIN_ATTEMPTS.inc("unknown_user")
     raise InvalidCredentials()
 
 
@@ -125,20 +153,63 @@ async def verify_user_account(token: str, session: AsyncSession = Depends(get_se
     )
 
 @auth_router.get("/refresh_token")
-async def get_new_access_token(token_details: dict = Depends(RefreshTokenBearer)):
+async def get_new_access_token(
+    token_details: dict = Depends(refresh_token_bearer),
+    session: AsyncSession = Depends(get_session),
+):
     expiry_timestamp = token_details["exp"]
 
     if (datetime.fromtimestamp(expiry_timestamp) > datetime.now()):
-        new_access_token = create_access_token(user_data=token_details["user"])
+        # Issue the token for the account as it is now, not as it was at login
+        user = await user_service.get_cached_user_by_username(token_details["user"]["username"], session)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        new_access_token = create_access_token(
+            user_data={
+                "username": user.username,
+                "uid": user.uid,
+                "role": user.role
+            }
+        )
 
         return JSONResponse(
             content={"access_token": new_access_token},
         )
     raise InvalidToken()
 
-@auth_router.get("/logout")
-async def revoke_token(token_details: dict = Depends(AccessTokenBearer)):
-    jti = token_details["jti"]
+@auth_router.api_route("/logout", methods=["GET", "POST"])
+async def revoke_token(
+    body: Optional[LogoutModel] = None,
+    token_details: dict = Depends(access_token_bearer),
+):
+    """
+    Revoke the access token, and the refresh token when it is sent in the
+    body; otherwise the refresh token can mint access tokens until it expires
+    """
+    if body is not None and body.refresh_token:
+        try:
+            refresh_details = decode_token(body.refresh_token)
+        except jwt.ExpiredSignatureError:
+            # Already unusable, nothing to revoke
+            refresh_details = None
+        except jwt.InvalidTokenError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token",
+            )
+        if refresh_details is not None:
+            if (not refresh_details.get("refresh")
+                    or refresh_details["user"]["uid"] != token_details["user"]["uid"]):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid refresh token",
+                )
+            await revocation_list.revoke(refresh_details["jti"], refresh_details["exp"])
+
+    await revocation_list.revoke(token_details["jti"], token_details["exp"])
 
     return JSONResponse(
         content={"message": "Logged Out successfully"},
@@ -147,10 +218,19 @@ async def revoke_token(token_details: dict = Depends(AccessTokenBearer)):
 
 @auth_router.get("/users/", status_code=status.HTTP_200_OK, dependencies=[role_checker])
 async def get_all_users(
+    params: PageParams = Depends(),
+    session: AsyncSession = Depends(get_session),
+    _: dict = Depends(access_token_bearer),
+):
+    """Get one page of user accounts"""
+    return await user_service.get_users_page(params, session)
+
+@auth_router.get("/users/export", status_code=status.HTTP_200_OK, dependencies=[role_checker])
+async def export_users(
     session: AsyncSession = Depends(get_session),
     _: dict = Depends(access_token_bearer),
 ):
-    """Get all user accounts"""
+    """Get all user accounts in one response"""
     users = await user_service.get_all_users(session)
     return users
 
@@ -191,14 +271,14 @@ async def change_password(
         
         # Verify current password
         user = await user_service.get_user_by_id(user_id, session)
-        if not verify_password(current_password, user.password_hash):
+        if not await verify_password_async(current_password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Mật khẩu hiện tại không đúng"
             )
         
         # Update password
-        hashed_password = generate_password_hash(new_password)
+        hashed_password = await generate_password_hash_async(new_password)
         await user_service.update_password(user_id, hashed_password, session)
         
         return {"message": "Đổi mật khẩu thành công"}
@@ -207,4 +287,14 @@ async def change_password(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+
+@well_known_router.get("/.well-known/jwks.json", include_in_schema=False)
+async def get_jwks():
+    """Public keys for verifying access tokens without calling this API"""
+    jwks = key_store.jwks() if key_store is not None else {"keys": []}
+    return JSONResponse(
+        content=jwks,
+        headers={"Cache-Control": "public, max-age=300"},
+    )
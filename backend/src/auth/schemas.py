@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -8,6 +8,9 @@ class LoginModel(BaseModel):
     username: str = Field(..., min_length=3, max_length=20)
     password: str = Field(..., min_length=8)
 
+class LogoutModel(BaseModel):
+    refresh_token: Optional[str] = None
+
 class UserCreateModel(BaseModel):
     username: str = Field(..., min_length=3, max_length=20)
     password: str = Field(..., min_length=8)
@@ -1,12 +1,17 @@
 import uuid
+import logging
 from sqlmodel import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 from fastapi import HTTPException, status
 
 from db.models import User, UserRole
+from db.pagination import PageParams, paginate
 from auth.schemas import UserCreateModel
-from auth.utils import generate_password_hash
+from auth.utils import generate_password_hash_async
+from auth.user_cache import user_cache
+
+logger = logging.getLogger(__name__)
 
 class UserService:
     async def get_user_by_id(self, user_id: str, session: AsyncSession) -> User:
@@ -16,23 +21,33 @@ class UserService:
         return result.scalar_one_or_none()
 
     async def get_user_by_username(self, username: str, session: AsyncSession) -> User:
-        print("username: ", username)
         statement = select(User).where(User.username == username)
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_cached_user_by_username(self, username: str, session: AsyncSession) -> User:
+        """Get user by username through the per-worker user cache"""
+        cached = user_cache.get_by_username(username)
+        if cached is not None:
+            # Attach a copy to this session without reloading the row
+            return await session.merge(cached, load=False)
+
+        user = await self.get_user_by_username(username, session)
+        if user is not None:
+            user_cache.put(user)
+        return user
+
     async def user_exists(self, username: str, session: AsyncSession) -> bool:
         user = await self.get_user_by_username(username, session)
         return True if user is not None else False
     
     async def create_user(self, user_data: UserCreateModel, session: AsyncSession):
-        print('user_data', user_data);
         user = User(
             username=user_data.username,
-            password_hash=generate_password_hash(user_data.password),
+            password_hash=await generate_password_hash_async(user_data.password),
             role=UserRole(user_data.role)
         )
-        print('user', user);
+        logger.debug("Creating user %s with role %s", user_data.username, user_data.role)
         session.add(user)
         await session.commit()
         await session.refresh(user)
@@ -43,37 +58,46 @@ class UserService:
             setattr(user, k, v)
 
         await session.commit()
+        await user_cache.invalidate(user.uid)
 
         return user
 
+    @staticmethod
+    def _user_list_row(row) -> dict:
+        # Convert to dict and remove sensitive info
+        user = row[0]
+        return {
+            "id": user.uid,
+            "username": user.username,
+            "role": user.role,
+            "is_verified": user.is_verified,
+            "created_at": user.created_at
+        }
+
     async def get_all_users(self, session: AsyncSession) -> List[dict]:
         """Get all users"""
         try:
-            print("Getting all users")
             statement = select(User)
             result = await session.execute(statement)
-            users = result.scalars().all()
-            
-            # Convert to list of dicts and remove sensitive info
-            user_list = []
-            for user in users:
-                user_dict = {
-                    "id": user.uid,
-                    "username": user.username,
-                    "role": user.role,
-                    "is_verified": user.is_verified,
-                    "created_at": user.created_at
-                }
-                user_list.append(user_dict)
-            
-            return user_list
+            return [self._user_list_row(row) for row in result]
         except Exception as e:
-            print(f"Error getting users: {str(e)}")
+            logger.exception("Error getting users")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to fetch users"
             )
 
+    async def get_users_page(self, params: PageParams, session: AsyncSession) -> dict:
+        """Get one keyset page of users"""
+        return await paginate(
+            session,
+            select(User),
+            params,
+            id_column=User.uid,
+            sort_columns={"id": User.uid},
+            row_to_item=self._user_list_row,
+        )
+
     async def update_password(self, user_id: str, new_password_hash: str, session: AsyncSession):
         """Update user password"""
         try:
@@ -86,4 +110,5 @@ class UserService:
             await session.commit()
         except Exception as e:
             await session.rollback()
-            raise e
\ No newline at end of file
+            raise e
+        await user_cache.invalidate(user_id)
\ No newline at end of file
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import redis.asyncio as aioredis
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from config import settings
+from db.models import User
+from db.redis import token_blocklists
+from metrics import REDIS_COMMAND_DURATION, USER_CACHE_REQUESTS, observe_duration
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user-invalidations"
+
+
+class UserCache:
+    """
+    Per-worker TTL/LRU cache of user rows keyed by uid, with a username index.
+    Entries are detached copies; callers merge them into their own session.
+    Invalidations are broadcast to other workers over Redis pub/sub when
+    Redis is reachable, and the TTL bounds staleness when it is not.
+    """
+
+    def __init__(self, max_size: int, ttl: float, redis: aioredis.Redis = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.redis = redis or token_blocklists
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._uids_by_username = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        uid = self._uids_by_username.get(username)
+        entry = self._entries.get(uid) if uid is not None else None
+        if entry is None:
+            USER_CACHE_REQUESTS.inc("miss")
+            return None
+
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            self._evict(uid)
+            USER_CACHE_REQUESTS.inc("miss")
+            return None
+
+        self._entries.move_to_end(uid)
+        USER_CACHE_REQUESTS.inc("hit")
+        return user
+
+    def put(self, user: User) -> None:
+        if self.max_size <= 0:
+            return
+        uid = str(user.uid)
+        self._evict(uid)
+        # Copy every mapped column so the cached row is not tied to any session.
+        # model_dump() would drop password_hash, which is excluded from dumps,
+        # and reading it later would try to lazy-load outside a greenlet
+        cached = User(**{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+        make_transient_to_detached(cached)
+        self._entries[uid] = (time.monotonic() + self.ttl, cached)
+        self._uids_by_username[user.username] = uid
+        while len(self._entries) > self.max_size:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, uid: str) -> None:
+        entry = self._entries.pop(uid, None)
+        if entry is not None and self._uids_by_username.get(entry[1].username) == uid:
+            del self._uids_by_username[entry[1].username]
+
+    async def invalidate(self, uid: str) -> None:
+        """Drop a user here and on every other worker"""
+        self._evict(str(uid))
+        try:
+            with observe_duration(REDIS_COMMAND_DURATION, "publish"):
+                await self.redis.publish(INVALIDATION_CHANNEL, str(uid))
+        except Exception as e:
+            logger.warning(f"Could not broadcast user invalidation: {str(e)}")
+
+    async def _run(self) -> None:
+        delay = 1
+        while True:
+            try:
+                pubsub = self.redis.pubsub()
+                try:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # Anything cached while unsubscribed may have missed an invalidation
+                    self.clear()
+                    delay = 1
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._evict(message["data"].decode())
+                finally:
+                    await pubsub.aclose()
+            except Exception as e:
+                logger.warning(f"User cache invalidation feed unavailable, retrying in {delay}s: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._uids_by_username.clear()
+
+    def start(self) -> None:
+        """Listen for invalidations from other workers in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
@@ -1,25 +1,137 @@
+import asyncio
+import hashlib
 import logging
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
 from itsdangerous import URLSafeTimedSerializer
 
 from config import settings
+from auth.keys import key_store
+from errors.auth_errors import PasswordHashBusy
+from metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_QUEUE_WAIT,
+    observe_duration,
+)
 
 import jwt
 from passlib.context import CryptContext
 
-passwd_context = CryptContext(schemes=["bcrypt"])
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
+
+
+def build_password_context(
+    scheme: str = None,
+    bcrypt_rounds: int = None,
+    argon2_time_cost: int = None,
+    argon2_memory_cost: int = None,
+    argon2_parallelism: int = None,
+) -> CryptContext:
+    """
+    Build the password context from Settings. Hashes made with another scheme
+    or a lower cost still verify, but are reported by needs_update.
+    """
+    scheme = scheme or settings.PASSWORD_HASH_SCHEME
+    if scheme not in PASSWORD_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    if scheme == "argon2":
+        try:
+            import argon2  # noqa: F401
+        except ImportError:
+            raise RuntimeError("PASSWORD_HASH_SCHEME=argon2 requires the argon2-cffi package")
+
+    bcrypt_rounds = bcrypt_rounds or settings.BCRYPT_ROUNDS
+    time_cost = argon2_time_cost or settings.ARGON2_TIME_COST
+    memory_cost = argon2_memory_cost or settings.ARGON2_MEMORY_COST
+    parallelism = argon2_parallelism or settings.ARGON2_PARALLELISM
+
+    return CryptContext(
+        schemes=[scheme] + [s for s in PASSWORD_SCHEMES if s != scheme],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=time_cost,
+        argon2__min_rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
+passwd_context = build_password_context()
 
 def generate_password_hash(password: str) -> str:
-    """Generate a password hash using bcrypt"""
-    return passwd_context.hash(password)
+    """Generate a password hash with the configured scheme"""
+    with observe_duration(PASSWORD_HASH_DURATION, "hash"):
+        return passwd_context.hash(password)
 
 # Alias for generate_password_hash to maintain compatibility
 get_password_hash = generate_password_hash
 
 def verify_password(password: str, hash: str) -> bool:
     """Verify a password against a hash"""
-    return passwd_context.verify(password, hash)
+    with observe_duration(PASSWORD_HASH_DURATION, "verify"):
+        return passwd_context.verify(password, hash)
+
+def verify_and_update_password(password: str, hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, when its hash uses an outdated scheme or cost,
+    return a replacement hash made with the current settings
+    """
+    with observe_duration(PASSWORD_HASH_DURATION, "verify"):
+        return passwd_context.verify_and_update(password, hash)
+
+# bcrypt releases the GIL, so a small thread pool hashes in parallel without
+# blocking the event loop. The pool size is the concurrency cap; extra calls queue.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_hash_pending = 0
+
+
+async def _run_in_hash_pool(func, *args):
+    global _hash_pending
+    if settings.PASSWORD_HASH_MAX_QUEUE and _hash_pending >= settings.PASSWORD_HASH_MAX_QUEUE:
+        raise PasswordHashBusy()
+
+    submitted = time.perf_counter()
+    _hash_pending += 1
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+
+    def run():
+        PASSWORD_HASH_QUEUE_WAIT.observe(value=time.perf_counter() - submitted)
+        return func(*args)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, run)
+    finally:
+        _hash_pending -= 1
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+
+async def generate_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool instead of the event loop"""
+    return await _run_in_hash_pool(generate_password_hash, password)
+
+
+async def verify_password_async(password: str, hash: str) -> bool:
+    """Verify a password on the hashing pool instead of the event loop"""
+    return await _run_in_hash_pool(verify_password, password, hash)
+
+
+async def verify_and_update_password_async(password: str, hash: str) -> Tuple[bool, Optional[str]]:
+    """Verify and, if needed, rehash a password on the hashing pool"""
+    return await _run_in_hash_pool(verify_and_update_password, password, hash)
+
+
+def close_password_hasher() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
 
 def create_access_token(
     user_data: dict, 
@@ -38,24 +150,88 @@ def create_access_token(
         "refresh": refresh
     }
 
-    token = jwt.encode(
-        payload=payload,
-        key=settings.JWT_SECRET,
-        algorithm=settings.JWT_ALGORITHM
-    )
+    if key_store is not None:
+        kid, key = key_store.signing_key()
+        token = jwt.encode(
+            payload=payload,
+            key=key,
+            algorithm=settings.JWT_ALGORITHM,
+            headers={"kid": kid}
+        )
+    else:
+        token = jwt.encode(
+            payload=payload,
+            key=settings.JWT_SECRET,
+            algorithm=settings.JWT_ALGORITHM
+        )
 
     return token
 
+class TokenCache:
+    """
+    Bounded LRU of verified token claims keyed by the token's SHA-256 digest.
+    Entries are only served until the token's own ``exp``.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        if self.max_size <= 0 or "exp" not in claims:
+            return
+        key = self._key(token)
+        self._entries[key] = (float(claims["exp"]), claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = TokenCache(settings.JWT_CACHE_SIZE)
+
+def _verification_key(token: str):
+    if key_store is None:
+        return settings.JWT_SECRET
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = key_store.verification_key(kid) if kid else None
+    if key is None:
+        raise jwt.InvalidTokenError("Unknown signing key")
+    return key
+
 def decode_token(token: str) -> dict:
     """
     Decode and verify a JWT token
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         decoded_token = jwt.decode(
             token, 
-            settings.JWT_SECRET, 
+            _verification_key(token), 
             algorithms=[settings.JWT_ALGORITHM]
         )
+        token_cache.put(token, decoded_token)
         return decoded_token
     except jwt.ExpiredSignatureError:
         raise jwt.ExpiredSignatureError("Token has expired")
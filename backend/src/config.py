@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,14 +9,83 @@ class Settings(BaseSettings):
     # API settings
     API_V1_PREFIX: str = "/api/v1"
     
+    # Logging settings
+    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")  # "production" drops debug records
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")  # per-module overrides, e.g. "auth=DEBUG,sqlalchemy=WARNING"
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL")
-    
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30 minutes
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT: int = int(os.getenv("DB_STATEMENT_TIMEOUT", "30000"))  # milliseconds, 0 disables
+    DB_STREAM_BATCH_SIZE: int = int(os.getenv("DB_STREAM_BATCH_SIZE", "1000"))  # rows per server-side fetch
+
+    # SQL instrumentation settings
+    DB_QUERY_BUDGET: int = int(os.getenv("DB_QUERY_BUDGET", "0"))  # statements per request, 0 disables
+    DB_QUERY_BUDGET_STRICT: bool = os.getenv("DB_QUERY_BUDGET_STRICT", "false").lower() == "true"
+    DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "true").lower() == "true"
+
+    # Read replica settings
+    DATABASE_READ_URL: Optional[str] = os.getenv("DATABASE_READ_URL")
+    DB_REPLICA_MAX_LAG: int = int(os.getenv("DB_REPLICA_MAX_LAG", "5"))  # seconds
+    DB_REPLICA_CHECK_INTERVAL: int = int(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))  # seconds
+    DB_READ_STICKY_SECONDS: int = int(os.getenv("DB_READ_STICKY_SECONDS", "5"))  # primary reads after a write
+
     # JWT settings
     JWT_SECRET: str = os.getenv("JWT_SECRET")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_EXPIRATION: int = int(os.getenv("JWT_EXPIRATION", "86400"))  # 24 hours
     JWT_REFRESH_EXPIRATION: int = int(os.getenv("JWT_REFRESH_EXPIRATION", "604800"))  # 7 days
+    JWT_KEYS_DIR: str = os.getenv("JWT_KEYS_DIR", "keys")  # PEM keys for RS256/EdDSA, named <kid>.pem
+    JWT_ACTIVE_KID: Optional[str] = os.getenv("JWT_ACTIVE_KID")  # defaults to the newest key
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", "10000"))  # verified tokens kept in memory, 0 disables
+    
+    # Password hashing settings
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))  # concurrent hashes per process
+    PASSWORD_HASH_SCHEME: str = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")  # "bcrypt" or "argon2"
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", "3"))
+    ARGON2_MEMORY_COST: int = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", "4"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "0"))  # pending hashes before 503, 0 disables
+    
+    # Token revocation settings
+    REVOCATION_FILTER_CAPACITY: int = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+    REVOCATION_FILTER_ERROR_RATE: float = float(os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001"))
+    REVOCATION_REBUILD_INTERVAL: int = int(os.getenv("REVOCATION_REBUILD_INTERVAL", "300"))  # seconds
+    
+    # Login rate limit settings
+    LOGIN_RATE_LIMIT_ENABLED: bool = os.getenv("LOGIN_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    LOGIN_RATE_USERNAME_BURST: int = int(os.getenv("LOGIN_RATE_USERNAME_BURST", "5"))
+    LOGIN_RATE_USERNAME_PER_MINUTE: int = int(os.getenv("LOGIN_RATE_USERNAME_PER_MINUTE", "5"))
+    LOGIN_RATE_IP_BURST: int = int(os.getenv("LOGIN_RATE_IP_BURST", "20"))
+    LOGIN_RATE_IP_PER_MINUTE: int = int(os.getenv("LOGIN_RATE_IP_PER_MINUTE", "60"))
+    
+    # User cache settings
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))  # 0 disables
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "60"))  # seconds
+    
+    # Dashboard stats settings
+    STATS_RECONCILE_INTERVAL: int = int(os.getenv("STATS_RECONCILE_INTERVAL", "3600"))  # seconds, 0 disables
+    
+    # Employee import settings
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))  # rows validated and inserted together
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))  # row errors kept per job
+    
+    # Profile image settings
+    MEDIA_DIR: str = os.getenv("MEDIA_DIR", "uploads")  # originals and thumbnails are stored here
+    MEDIA_URL: str = os.getenv("MEDIA_URL", "/media")  # public URL prefix the files are served under
+    MEDIA_ACCEL_REDIRECT: str = os.getenv("MEDIA_ACCEL_REDIRECT", "")  # nginx internal location, empty serves from Python
+    IMAGE_MAX_BYTES: int = int(os.getenv("IMAGE_MAX_BYTES", str(5 * 1024 * 1024)))  # largest accepted upload
+    IMAGE_THUMBNAIL_SIZES: str = os.getenv("IMAGE_THUMBNAIL_SIZES", "64,256")  # square thumbnail edges in pixels
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", "2"))  # processes resizing images
     
     # CORS settings
     CORS_ORIGINS: list = [
@@ -0,0 +1,3 @@
+from .generator import DataGenerator, DatasetConfig, generate
+
+__all__ = ['DataGenerator', 'DatasetConfig', 'generate']
@@ -0,0 +1,332 @@
+import logging
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List
+
+from pydantic import BaseModel, Field
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from db.models import (
+    User, UserRole, Gender, MaritalStatus,
+    Department, Position, Employee, Education, Contract, Payroll, WorkPoint, Attendance,
+    employee_search_values
+)
+from auth.utils import generate_password_hash
+from db.counters import reconcile
+
+logger = logging.getLogger(__name__)
+
+FAMILY_NAMES = [
+    "Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Huỳnh", "Phan", "Vũ",
+    "Võ", "Đặng", "Bùi", "Đỗ", "Hồ", "Ngô", "Dương", "Lý",
+]
+FAMILY_WEIGHTS = [38, 11, 9.5, 7, 5.1, 5.1, 4.5, 3.9, 3.9, 2.1, 2, 1.4, 1.3, 1.3, 1, 0.5]
+MALE_MIDDLE_NAMES = ["Văn", "Hữu", "Đức", "Minh", "Quang", "Thành", "Công", "Xuân"]
+FEMALE_MIDDLE_NAMES = ["Thị", "Ngọc", "Thu", "Thanh", "Minh", "Kim", "Mỹ", "Hồng"]
+MALE_GIVEN_NAMES = [
+    "An", "Bình", "Cường", "Dũng", "Đạt", "Hải", "Hiếu", "Hùng", "Huy", "Khoa",
+    "Khánh", "Long", "Nam", "Phong", "Phúc", "Quân", "Sơn", "Thắng", "Trung", "Tuấn",
+]
+FEMALE_GIVEN_NAMES = [
+    "Anh", "Châu", "Diệp", "Giang", "Hà", "Hạnh", "Hương", "Lan", "Linh", "Mai",
+    "Ngân", "Nhung", "Oanh", "Phương", "Quỳnh", "Thảo", "Trang", "Uyên", "Vy", "Yến",
+]
+PROVINCES = [
+    "Hà Nội", "TP. Hồ Chí Minh", "Hải Phòng", "Đà Nẵng", "Cần Thơ", "Nghệ An",
+    "Thanh Hóa", "Nam Định", "Thái Bình", "Huế", "Quảng Ninh", "Bình Dương",
+]
+ETHNICITIES = ["Kinh", "Tày", "Thái", "Mường", "Khmer", "Hoa", "Nùng"]
+ETHNICITY_WEIGHTS = [85, 2, 2, 1.5, 1.5, 1, 1]
+STREETS = ["Trần Hưng Đạo", "Lê Lợi", "Nguyễn Huệ", "Hai Bà Trưng", "Lý Thường Kiệt", "Điện Biên Phủ"]
+DEPARTMENT_NAMES = [
+    "Kế toán", "Nhân sự", "Kinh doanh", "Marketing", "Kỹ thuật", "Sản xuất",
+    "Hành chính", "Pháp chế", "Chăm sóc khách hàng", "Công nghệ thông tin",
+]
+POSITION_TITLES = [
+    "Nhân viên", "Chuyên viên", "Trưởng nhóm", "Phó phòng", "Trưởng phòng",
+    "Kỹ sư", "Kế toán viên", "Giám đốc", "Thực tập sinh", "Tư vấn viên",
+]
+DEGREES = ["Cử nhân", "Kỹ sư", "Thạc sĩ", "Tiến sĩ", "Cao đẳng"]
+SCHOOLS = [
+    "Đại học Quốc gia Hà Nội", "Đại học Bách khoa Hà Nội", "Đại học Kinh tế Quốc dân",
+    "Đại học Bách khoa TP.HCM", "Đại học Ngoại thương", "Đại học Đà Nẵng",
+]
+MAJORS = ["Kế toán", "Quản trị kinh doanh", "Công nghệ thông tin", "Luật", "Kỹ thuật điện", "Tài chính"]
+RANKINGS = ["Xuất sắc", "Giỏi", "Khá", "Trung bình"]
+CONTRACT_TYPES = ["Full-time", "Part-time", "Probation", "Fixed-term"]
+
+
+class DatasetConfig(BaseModel):
+    """Sizes and distributions of a generated dataset"""
+    seed: int = 42
+    # Every generated date counts back from this day, so a seed gives the same data on any day
+    anchor_date: date = date(2026, 1, 1)
+    users: int = Field(default=10, ge=1)
+    departments: int = Field(default=20, ge=1)
+    positions: int = Field(default=30, ge=1)
+    employees: int = Field(default=1000, ge=0)
+    contracts_per_employee: float = Field(default=1.5, ge=0)
+    education_per_employee: float = Field(default=1.2, ge=0)
+    payroll_months: int = Field(default=12, ge=0)
+    workpoint_days: int = Field(default=30, ge=0)
+    attendance_days: int = Field(default=30, ge=0)
+
+    # Department sizes follow a Zipf-like curve; 0 makes them uniform
+    department_skew: float = Field(default=1.0, ge=0)
+    female_ratio: float = Field(default=0.48, ge=0, le=1)
+    married_ratio: float = Field(default=0.55, ge=0, le=1)
+    salary_median: float = Field(default=15_000_000, gt=0)
+    salary_sigma: float = Field(default=0.45, ge=0)
+    absence_rate: float = Field(default=0.04, ge=0, le=1)
+    late_rate: float = Field(default=0.08, ge=0, le=1)
+
+    admin_username: str = "admin"
+    admin_password: str = "admin123456"
+    batch_size: int = Field(default=5000, ge=1)
+
+
+class DataGenerator:
+    """Fills the schema with referentially consistent, reproducible HR data"""
+
+    def __init__(self, engine: AsyncEngine, config: DatasetConfig):
+        self.engine = engine
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.today = config.anchor_date
+        self.now = datetime(self.today.year, self.today.month, self.today.day)
+
+    async def bulk_insert(self, table, rows: Iterable[dict]) -> int:
+        """Insert rows in batches of ``batch_size``, one transaction per batch.
+
+        Each batch is a single executemany call, which the MySQL drivers send
+        as multi-row INSERT ... VALUES (...), (...) statements. This is several
+        times faster than compiling an equivalent insert().values([...]).
+        """
+        total = 0
+        batch: List[dict] = []
+
+        async def flush():
+            async with self.engine.begin() as conn:
+                await conn.execute(insert(table), batch)
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.config.batch_size:
+                await flush()
+                total += len(batch)
+                batch = []
+        if batch:
+            await flush()
+            total += len(batch)
+        return total
+
+    async def generate(self) -> Dict[str, int]:
+        """Generate every table in dependency order and return row counts"""
+        steps = [
+            ("users", User, self.user_rows),
+            ("departments", Department, self.department_rows),
+            ("positions", Position, self.position_rows),
+            ("employees", Employee, self.employee_rows),
+            ("contracts", Contract, self.contract_rows),
+            ("education", Education, self.education_rows),
+            ("payrolls", Payroll, self.payroll_rows),
+            ("work_points", WorkPoint, self.workpoint_rows),
+            ("attendance", Attendance, self.attendance_rows),
+        ]
+        counts = {}
+        for name, model, rows in steps:
+            started = time.perf_counter()
+            counts[name] = await self.bulk_insert(model.__table__, rows())
+            logger.info(f"Inserted {counts[name]} {name} in {time.perf_counter() - started:.1f}s")
+
+        # Core inserts skip the ORM hooks that maintain the dashboard counters
+        async with self.engine.begin() as conn:
+            await conn.run_sync(reconcile)
+        return counts
+
+    # Row factories
+
+    def user_rows(self) -> Iterator[dict]:
+        # bcrypt is deliberately slow, so every generated account shares one hash
+        password_hash = generate_password_hash(self.config.admin_password)
+        for i in range(self.config.users):
+            yield {
+                "uid": str(uuid.UUID(int=self.rng.getrandbits(128), version=4)),
+                "username": self.config.admin_username if i == 0 else f"user{i:05d}",
+                "password_hash": password_hash,
+                "role": UserRole.ADMIN if i == 0 else UserRole.USER,
+                "is_verified": True,
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def department_rows(self) -> Iterator[dict]:
+        for i in range(1, self.config.departments + 1):
+            base = DEPARTMENT_NAMES[(i - 1) % len(DEPARTMENT_NAMES)]
+            suffix = (i - 1) // len(DEPARTMENT_NAMES)
+            yield {
+                "id": i,
+                "department_code": f"D{i:05d}",
+                "name": f"Phòng {base}" + (f" {suffix + 1}" if suffix else ""),
+            }
+
+    def position_rows(self) -> Iterator[dict]:
+        for i in range(1, self.config.positions + 1):
+            base = POSITION_TITLES[(i - 1) % len(POSITION_TITLES)]
+            suffix = (i - 1) // len(POSITION_TITLES)
+            yield {
+                "id": i,
+                "position_code": f"P{i:05d}",
+                "title": base + (f" bậc {suffix + 1}" if suffix else ""),
+                "description": None,
+            }
+
+    def employee_rows(self) -> Iterator[dict]:
+        config, rng = self.config, self.rng
+        department_ids = list(range(1, config.departments + 1))
+        department_weights = [1 / (rank ** config.department_skew) for rank in department_ids]
+        position_ids = list(range(1, config.positions + 1))
+
+        for i in range(1, config.employees + 1):
+            female = rng.random() < config.female_ratio
+            family = rng.choices(FAMILY_NAMES, FAMILY_WEIGHTS)[0]
+            if female:
+                middle, given = rng.choice(FEMALE_MIDDLE_NAMES), rng.choice(FEMALE_GIVEN_NAMES)
+            else:
+                middle, given = rng.choice(MALE_MIDDLE_NAMES), rng.choice(MALE_GIVEN_NAMES)
+            birth_date = self.today - timedelta(days=rng.randint(20 * 365, 60 * 365))
+            province = rng.choice(PROVINCES)
+
+            row = {
+                "id": i,
+                "employee_code": f"E{i:07d}",
+                "position_id": rng.choice(position_ids),
+                "department_id": rng.choices(department_ids, department_weights)[0],
+                "salary": round(rng.lognormvariate(0, config.salary_sigma) * config.salary_median, -3),
+                "gender": Gender.FEMALE if female else Gender.MALE,
+                "contract_id": f"C{i:07d}",
+                "full_name": f"{family} {middle} {given}",
+                "birth_date": birth_date,
+                "birth_place": province,
+                "id_number": f"0{rng.randint(10**10, 10**11 - 1)}",
+                "phone": f"0{rng.choice([3, 5, 7, 8, 9])}{rng.randint(10**7, 10**8 - 1)}",
+                "address": f"{rng.randint(1, 300)} {rng.choice(STREETS)}, {province}",
+                "email": f"e{i:07d}@example.com",
+                "marital_status": MaritalStatus.MARRIED if rng.random() < config.married_ratio else MaritalStatus.SINGLE,
+                "ethnicity": rng.choices(ETHNICITIES, ETHNICITY_WEIGHTS)[0],
+                "education_level_id": None,
+                "id_card_date": birth_date + timedelta(days=18 * 365 + rng.randint(0, 3650)),
+                "id_card_place": province,
+                "health_insurance_number": f"HS{rng.randint(10**12, 10**13 - 1)}",
+                "social_insurance_number": f"{rng.randint(10**9, 10**10 - 1)}",
+                "profile_image_path": "none_image_profile",
+            }
+            # Core inserts skip the ORM events that normally fill these
+            row.update(employee_search_values(row))
+            yield row
+
+    def _count_for(self, mean: float) -> int:
+        """Per-employee count with the given mean, spread around it"""
+        whole = int(mean)
+        return whole + (1 if self.rng.random() < mean - whole else 0)
+
+    def contract_rows(self) -> Iterator[dict]:
+        rng = self.rng
+        for employee_id in range(1, self.config.employees + 1):
+            start = self.today - timedelta(days=rng.randint(30, 3650))
+            for n in range(self._count_for(self.config.contracts_per_employee)):
+                end = start + timedelta(days=365 * rng.randint(1, 3))
+                current = end >= self.today
+                yield {
+                    "employee_id": employee_id,
+                    "contract_type": rng.choice(CONTRACT_TYPES),
+                    "start_date": start,
+                    "end_date": end,
+                    "status": "active" if current else "expired",
+                    "salary": round(rng.lognormvariate(0, self.config.salary_sigma) * self.config.salary_median, -3),
+                    "notes": None,
+                    "created_at": self.now,
+                }
+                start = end + timedelta(days=1)
+
+    def education_rows(self) -> Iterator[dict]:
+        rng = self.rng
+        for employee_id in range(1, self.config.employees + 1):
+            for _ in range(self._count_for(self.config.education_per_employee)):
+                yield {
+                    "employee_id": employee_id,
+                    "degree_name": rng.choice(DEGREES),
+                    "school": rng.choice(SCHOOLS),
+                    "major": rng.choice(MAJORS),
+                    "graduation_year": str(rng.randint(1985, self.today.year)),
+                    "ranking": rng.choice(RANKINGS),
+                }
+
+    def _months(self, count: int) -> List[date]:
+        months = []
+        for m in range(count):
+            year, month = divmod(self.today.year * 12 + self.today.month - 1 - m, 12)
+            months.append(date(year, month + 1, 1))
+        return months
+
+    def _working_days(self, count: int) -> List[date]:
+        days, day = [], self.today
+        while len(days) < count:
+            if day.weekday() < 5:
+                days.append(day)
+            day -= timedelta(days=1)
+        return days
+
+    def payroll_rows(self) -> Iterator[dict]:
+        rng = self.rng
+        for month in self._months(self.config.payroll_months):
+            for employee_id in range(1, self.config.employees + 1):
+                yield {
+                    "employee_id": employee_id,
+                    "month": month,
+                    "base_salary": round(rng.lognormvariate(0, self.config.salary_sigma) * self.config.salary_median, -3),
+                    "allowance": rng.choice([0, 500_000, 1_000_000, 2_000_000]),
+                    "deduction": rng.choice([0, 0, 200_000, 500_000]),
+                    "notes": None,
+                    "created_at": self.now,
+                }
+
+    def _attendance_status(self) -> str:
+        roll = self.rng.random()
+        if roll < self.config.absence_rate:
+            return "absent"
+        if roll < self.config.absence_rate + self.config.late_rate:
+            return "late"
+        return "present"
+
+    def workpoint_rows(self) -> Iterator[dict]:
+        for day in self._working_days(self.config.workpoint_days):
+            for employee_id in range(1, self.config.employees + 1):
+                status = self._attendance_status()
+                yield {
+                    "employee_id": employee_id,
+                    "month": day.month,
+                    "year": day.year,
+                    "day": day.day,
+                    "points": 0.0 if status == "absent" else (0.5 if status == "late" else 1.0),
+                    "notes": None,
+                    "created_at": self.now,
+                }
+
+    def attendance_rows(self) -> Iterator[dict]:
+        for day in self._working_days(self.config.attendance_days):
+            for employee_id in range(1, self.config.employees + 1):
+                yield {
+                    "employee_id": employee_id,
+                    "date": day,
+                    "status": self._attendance_status(),
+                    "notes": None,
+                    "created_at": self.now,
+                }
+
+
+async def generate(engine: AsyncEngine, config: DatasetConfig) -> Dict[str, int]:
+    return await DataGenerator(engine, config).generate()
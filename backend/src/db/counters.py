@@ -0,0 +1,195 @@
+from collections import Counter
+from enum import Enum
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, event, func, inspect, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+
+from db.models import Contract, Department, Employee, StatCounter
+
+# Employee headcount breakdowns: counter metric -> employee column
+EMPLOYEE_BREAKDOWNS = {
+    "employees_by_department": "department_id",
+    "employees_by_position": "position_id",
+    "employees_by_gender": "gender",
+    "employees_by_marital_status": "marital_status",
+}
+
+# Tables counted as a whole: counter metric -> model
+TABLE_TOTALS = {
+    "employees": Employee,
+    "departments": Department,
+    "contracts": Contract,
+}
+
+TOTAL_KEY = "total"
+_PENDING_KEY = "stat_counter_deltas"
+
+CounterKey = Tuple[str, str]
+
+
+def _key_value(value) -> str:
+    return str(value.value if isinstance(value, Enum) else value)
+
+
+def _employee_keys(values: Dict[str, object]) -> List[CounterKey]:
+    return [
+        (metric, _key_value(values[column]))
+        for metric, column in EMPLOYEE_BREAKDOWNS.items()
+        if values.get(column) is not None
+    ]
+
+
+def _pending(target) -> Counter:
+    session = object_session(target)
+    return session.info.setdefault(_PENDING_KEY, Counter())
+
+
+def _on_insert(mapper, connection, target):
+    pending = _pending(target)
+    pending[(mapper.local_table.name, TOTAL_KEY)] += 1
+    if isinstance(target, Employee):
+        for key in _employee_keys({c: getattr(target, c) for c in EMPLOYEE_BREAKDOWNS.values()}):
+            pending[key] += 1
+
+
+def _on_delete(mapper, connection, target):
+    pending = _pending(target)
+    pending[(mapper.local_table.name, TOTAL_KEY)] -= 1
+    if isinstance(target, Employee):
+        # Count the row as it was stored, not as it may have been edited before deletion
+        old = {}
+        for column in EMPLOYEE_BREAKDOWNS.values():
+            history = inspect(target).attrs[column].history
+            old[column] = history.deleted[0] if history.deleted else getattr(target, column)
+        for key in _employee_keys(old):
+            pending[key] -= 1
+
+
+def _on_employee_update(mapper, connection, target):
+    state = inspect(target)
+    old, new = {}, {}
+    for column in EMPLOYEE_BREAKDOWNS.values():
+        history = state.attrs[column].history
+        if history.deleted:
+            old[column] = history.deleted[0]
+            new[column] = getattr(target, column)
+    if not new:
+        return
+
+    pending = _pending(target)
+    for key in _employee_keys(old):
+        pending[key] -= 1
+    for key in _employee_keys(new):
+        pending[key] += 1
+
+
+for _model in TABLE_TOTALS.values():
+    event.listen(_model, "after_insert", _on_insert)
+    event.listen(_model, "after_delete", _on_delete)
+event.listen(Employee, "after_update", _on_employee_update)
+
+
+def employee_row_deltas(rows: Iterable[dict]) -> Counter:
+    """Counter changes for employee rows inserted without the ORM"""
+    deltas = Counter()
+    for row in rows:
+        deltas[("employees", TOTAL_KEY)] += 1
+        for key in _employee_keys(row):
+            deltas[key] += 1
+    return deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_pending_counters(session, flush_context):
+    """Write the flush's counter changes in the same transaction as the rows"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        apply_deltas(session.connection(), pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_counters(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def apply_deltas(connection: Connection, deltas: Dict[CounterKey, int]) -> None:
+    """Add deltas to the counters, creating missing ones"""
+    table = StatCounter.__table__
+    # A fixed order means concurrent writers lock counter rows in the same sequence
+    rows = [
+        {"metric": metric, "key": key, "value": delta}
+        for (metric, key), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        statement = mysql_insert(table).values(rows)
+        connection.execute(statement.on_duplicate_key_update(value=table.c.value + statement.inserted.value))
+    elif dialect == "sqlite":
+        statement = sqlite_insert(table).values(rows)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.metric, table.c.key],
+            set_={"value": table.c.value + statement.excluded.value},
+        ))
+    else:
+        for row in rows:
+            result = connection.execute(
+                update(table)
+                .where(table.c.metric == row["metric"], table.c.key == row["key"])
+                .values(value=table.c.value + row["value"])
+            )
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(**row))
+
+
+def count_all(connection: Connection) -> Dict[CounterKey, int]:
+    """Every counter computed from the tables themselves"""
+    counts = {}
+    for metric, model in TABLE_TOTALS.items():
+        counts[(metric, TOTAL_KEY)] = connection.execute(
+            select(func.count()).select_from(model.__table__)
+        ).scalar_one()
+
+    for metric, column_name in EMPLOYEE_BREAKDOWNS.items():
+        column = Employee.__table__.c[column_name]
+        result = connection.execute(
+            select(column, func.count()).where(column.is_not(None)).group_by(column)
+        )
+        for value, count in result:
+            counts[(metric, _key_value(value))] = count
+    return counts
+
+
+def reconcile(connection: Connection) -> int:
+    """
+    Rewrite the counters from a full count and return how many had drifted.
+    The counter rows are locked first, so writers that have not yet updated
+    them wait and apply their deltas on top of the recount.
+    """
+    table = StatCounter.__table__
+    stored = {
+        (metric, key): value
+        for metric, key, value in connection.execute(
+            select(table.c.metric, table.c.key, table.c.value)
+            .order_by(table.c.metric, table.c.key)
+            .with_for_update()
+        )
+    }
+    actual = count_all(connection)
+
+    drifted = [k for k in stored.keys() | actual.keys() if stored.get(k, 0) != actual.get(k, 0)]
+    if drifted:
+        connection.execute(delete(table))
+        connection.execute(insert(table), [
+            {"metric": metric, "key": key, "value": value}
+            for (metric, key), value in sorted(actual.items())
+        ])
+    return len(drifted)
+
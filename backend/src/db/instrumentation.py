@@ -0,0 +1,89 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """SQL statements issued while serving one request"""
+
+    def __init__(self, budget: int = 0):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+        self.budget = budget
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes issued at least ``threshold`` times"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget > 0 and self.count > self.budget
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(budget: int = 0) -> Iterator[QueryStats]:
+    """Collect statements executed in this context, e.g. around a request or in a test"""
+    stats = QueryStats(budget)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        # Parameters are bound separately, so the SQL text is the statement's shape
+        stats.record(statement, time.perf_counter() - start)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the per-request statement counters to an engine"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+class QueryBudget:
+    """Route dependency that overrides the default statement budget"""
+
+    def __init__(self, max_queries: int):
+        self.max_queries = max_queries
+
+    async def __call__(self) -> None:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.budget = self.max_queries
@@ -1,31 +1,128 @@
+import time
+from contextvars import ContextVar
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel, create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
 import logging
 
 from config import settings
+from db.instrumentation import instrument_engine
 
-async_engine = AsyncEngine(
-    create_engine(
-        url=settings.DATABASE_URL,
-        echo=True,
-        future=True
+
+# Time spent opening new connections during the current checkout
+_connect_time: ContextVar[float] = ContextVar("pool_connect_time", default=0.0)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            _connect_time.set(_connect_time.get() + time.perf_counter() - start)
+
+    def _do_get(self):
+        token = _connect_time.set(0.0)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            # Opening a connection is not queueing, so only the wait for a free slot counts
+            waited = time.perf_counter() - start - _connect_time.get()
+            _connect_time.reset(token)
+            self.wait_count += 1
+            self.wait_time_total += waited
+            if waited > self.wait_time_max:
+                self.wait_time_max = waited
+
+    def recreate(self):
+        # Keep the class and counters when the pool is rebuilt after invalidation
+        new_pool = super().recreate()
+        new_pool.wait_count = self.wait_count
+        new_pool.wait_time_total = self.wait_time_total
+        new_pool.wait_time_max = self.wait_time_max
+        return new_pool
+
+
+def create_db_engine(url: str, echo: bool = None) -> AsyncEngine:
+    """Create an async engine with pool settings taken from Settings"""
+    echo = settings.DB_ECHO if echo is None else echo
+
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite has no server side pool or statement timeout to tune
+        engine = create_async_engine(url, echo=echo, future=True)
+        instrument_engine(engine)
+        return engine
+
+    engine = create_async_engine(
+        url,
+        echo=echo,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
     )
+
+    if settings.DB_STATEMENT_TIMEOUT > 0:
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_statement_timeout(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET SESSION max_execution_time = {int(settings.DB_STATEMENT_TIMEOUT)}")
+            cursor.close()
+
+    instrument_engine(engine)
+    return engine
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict:
+    """Return live statistics for the engine's connection pool"""
+    pool = engine.sync_engine.pool
+    stats = {
+        "pool": pool.__class__.__name__,
+        "size": pool.size() if hasattr(pool, "size") else 0,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+        "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+        "wait_count": getattr(pool, "wait_count", 0),
+        "wait_time_total": getattr(pool, "wait_time_total", 0.0),
+        "wait_time_max": getattr(pool, "wait_time_max", 0.0),
+    }
+    return stats
+
+
+async_engine = create_db_engine(settings.DATABASE_URL)
+
+async_session_factory = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+
 async def init_db() -> None:
     async with async_engine.begin() as conn:
         from db.models import User
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
-async def get_session() -> AsyncSession:
-    Session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
+async def close_db() -> None:
+    await async_engine.dispose()
+
 
-    async with Session() as session:
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_factory() as session:
         try:
             yield session
         except Exception as e:
@@ -33,4 +130,4 @@ async def get_session() -> AsyncSession:
             await session.rollback()
             raise
         finally:
-            await session.close()   
\ No newline at end of file
+            await session.close()
@@ -1,10 +1,14 @@
+import time
 import uuid
 from datetime import date, datetime
 from typing import Optional, List
 import sqlalchemy.dialects.mysql as mysql
+from sqlalchemy import BigInteger, Index, event
 from sqlmodel import Field, Relationship, SQLModel, Column
 from enum import Enum
 
+from .search import build_search_text, fold_text
+
 class UserRole(str, Enum):
     USER = "user"
     ADMIN = "admin"
@@ -44,31 +48,55 @@ class MaritalStatus(str, Enum):
     DIVORCED = "Divorced"
     WIDOWED = "Widowed"
 
+def next_version(current: Optional[int] = None) -> int:
+    """
+    Row versions are microsecond timestamps, moved past the previous value when
+    the clock has not advanced. A row's version therefore grows on every write,
+    and the most recently written row of a table holds its highest version.
+    """
+    return max((current or 0) + 1, time.time_ns() // 1000)
+
+def version_column() -> Column:
+    """Version column for a model's version_id_col; indexed so max(version) is a single lookup"""
+    return Column(BigInteger, nullable=False, index=True, default=next_version, server_default="1")
+
+_department_version = version_column()
+
 class Department(SQLModel, table=True):
     __tablename__ = "departments"
+    __mapper_args__ = {"version_id_col": _department_version, "version_id_generator": next_version}
     
     id: int = Field(default=None, primary_key=True)
     department_code: str = Field(
         sa_column=Column(mysql.VARCHAR(8), unique=True, index=True)
     )
     name: str = Field(sa_column=Column(mysql.VARCHAR(50)))
+    version: Optional[int] = Field(default=None, sa_column=_department_version)
     
     # Relationships
     employees: List["Employee"] = Relationship(back_populates="department")
 
+_position_version = version_column()
+
 class Position(SQLModel, table=True):
     __tablename__ = "positions"
+    __mapper_args__ = {"version_id_col": _position_version, "version_id_generator": next_version}
     
     id: Optional[int] = Field(default=None, primary_key=True)
     position_code: str = Field(..., max_length=10)
     title: str = Field(..., max_length=100)
     description: Optional[str] = Field(default=None)
+    version: Optional[int] = Field(default=None, sa_column=_position_version)
     
     # Relationships
     employees: List["Employee"] = Relationship(back_populates="position")
 
+_employee_version = version_column()
+
 class Employee(SQLModel, table=True):
     __tablename__ = "employees"
+    # Every ORM write bumps the version and only applies if it is still the one loaded
+    __mapper_args__ = {"version_id_col": _employee_version, "version_id_generator": next_version}
     
     id: int = Field(default=None, primary_key=True)
     employee_code: str = Field(
@@ -102,6 +130,16 @@ class Employee(SQLModel, table=True):
     profile_image_path: str = Field(
         sa_column=Column(mysql.VARCHAR(40), default="none_image_profile")
     )
+    version: Optional[int] = Field(default=None, sa_column=_employee_version)
+    # Accent-folded copies of the searchable fields, kept in sync on insert/update
+    search_name: Optional[str] = Field(
+        sa_column=Column(mysql.VARCHAR(50), nullable=True, index=True),
+        exclude=True
+    )
+    search_text: Optional[str] = Field(
+        sa_column=Column(mysql.VARCHAR(255), nullable=True),
+        exclude=True
+    )
 
     # Relationships
     position: Position = Relationship(back_populates="employees")
@@ -117,6 +155,43 @@ class Employee(SQLModel, table=True):
     def __repr__(self):
         return f"<Employee {self.full_name}>"
 
+# Fields folded into search_text. id_number is left out because only some roles
+# may see it; those roles match it exactly through ix_employees_id_number instead
+EMPLOYEE_SEARCH_FIELDS = ("full_name", "employee_code", "email", "phone")
+
+# The ngram parser indexes two-letter syllables such as "le" or "vo", which the
+# default parser's minimum token size would drop
+Index(
+    "ix_employees_search_text",
+    Employee.__table__.c.search_text,
+    mysql_prefix="FULLTEXT",
+    mysql_with_parser="ngram",
+)
+
+# Composite indexes behind the employee list filters; each leads with the
+# equality filter and ends with the column it is commonly sorted or ranged on
+Index("ix_employees_department_position", Employee.department_id, Employee.position_id)
+Index("ix_employees_department_salary", Employee.department_id, Employee.salary)
+Index("ix_employees_position_salary", Employee.position_id, Employee.salary)
+Index("ix_employees_gender_marital_status", Employee.gender, Employee.marital_status)
+Index("ix_employees_salary", Employee.salary)
+Index("ix_employees_birth_date", Employee.birth_date)
+Index("ix_employees_id_number", Employee.id_number)
+
+def employee_search_values(values: dict) -> dict:
+    """Search column values for a row given its searchable fields"""
+    return {
+        "search_name": fold_text(values.get("full_name"))[:50],
+        "search_text": build_search_text((values.get(f) for f in EMPLOYEE_SEARCH_FIELDS), 255),
+    }
+
+@event.listens_for(Employee, "before_insert")
+@event.listens_for(Employee, "before_update")
+def _set_employee_search_columns(mapper, connection, target):
+    values = employee_search_values({f: getattr(target, f) for f in EMPLOYEE_SEARCH_FIELDS})
+    target.search_name = values["search_name"]
+    target.search_text = values["search_text"]
+
 class Education(SQLModel, table=True):
     __tablename__ = "education"
     
@@ -128,8 +203,11 @@ class Education(SQLModel, table=True):
     graduation_year: str
     ranking: str
 
+_contract_version = version_column()
+
 class Contract(SQLModel, table=True):
     __tablename__ = "contracts"
+    __mapper_args__ = {"version_id_col": _contract_version, "version_id_generator": next_version}
 
     id: Optional[int] = Field(default=None, primary_key=True)
     employee_id: int = Field(foreign_key="employees.id")
@@ -143,11 +221,15 @@ class Contract(SQLModel, table=True):
     updated_at: Optional[datetime] = Field(
         sa_column=Column(mysql.TIMESTAMP, nullable=True, onupdate=datetime.utcnow)
     )
+    version: Optional[int] = Field(default=None, sa_column=_contract_version)
 
     employee: Optional[Employee] = Relationship(back_populates="contracts")
 
+_payroll_version = version_column()
+
 class Payroll(SQLModel, table=True):
     __tablename__ = "payrolls"
+    __mapper_args__ = {"version_id_col": _payroll_version, "version_id_generator": next_version}
 
     id: Optional[int] = Field(default=None, primary_key=True)
     employee_id: int = Field(foreign_key="employees.id", index=True)
@@ -162,6 +244,7 @@ class Payroll(SQLModel, table=True):
     updated_at: Optional[datetime] = Field(
         sa_column=Column(mysql.TIMESTAMP, nullable=True, onupdate=datetime.utcnow)
     )
+    version: Optional[int] = Field(default=None, sa_column=_payroll_version)
 
     employee: Optional[Employee] = Relationship(back_populates="payrolls")
 
@@ -210,4 +293,11 @@ class Attendance(SQLModel, table=True):
         sa_column=Column(mysql.TIMESTAMP, nullable=True, onupdate=datetime.utcnow)
     )
 
-    employee: Optional["Employee"] = Relationship(back_populates="attendance")
\ No newline at end of file
+    employee: Optional["Employee"] = Relationship(back_populates="attendance")
+class StatCounter(SQLModel, table=True):
+    """Precomputed dashboard counts, e.g. ("employees_by_department", "3") -> 42"""
+    __tablename__ = "stat_counters"
+
+    metric: str = Field(sa_column=Column(mysql.VARCHAR(32), primary_key=True))
+    key: str = Field(sa_column=Column(mysql.VARCHAR(64), primary_key=True))
+    value: int = Field(default=0)
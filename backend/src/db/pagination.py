@@ -0,0 +1,172 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    limit: int
+
+
+class PageParams:
+    """Query parameters shared by every keyset-paginated list endpoint"""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+        sort: Optional[str] = Query(None, description="Indexed column to sort by"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json(column, value: Any) -> Any:
+    """Convert a cursor value back to the column's Python type"""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return value
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict) or payload.get("d") not in ("next", "prev"):
+            raise ValueError(cursor)
+        return payload
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def paginate(
+    session: AsyncSession,
+    statement,
+    params: PageParams,
+    id_column,
+    sort_columns: Dict[str, Any],
+    row_to_item: Callable[[Any], dict],
+    default_sort: str = "id",
+    id_key: str = "id",
+) -> dict:
+    """Run a keyset-paginated query.
+
+    ``sort_columns`` whitelists the indexed columns a client may sort by, keyed
+    by the name the column has in ``row_to_item``'s output; rows are always
+    tie-broken on ``id_column`` (``id_key`` in the output) so the order is stable.
+    """
+    sort = params.sort or default_sort
+    if sort not in sort_columns:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot sort by '{sort}', choose one of: {', '.join(sort_columns)}"
+        )
+    sort_column = sort_columns[sort]
+    same_column = sort_column is id_column
+
+    direction = "next"
+    if params.cursor:
+        position = decode_cursor(params.cursor)
+        if position.get("s") != sort:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the requested sort"
+            )
+        direction = position["d"]
+        try:
+            last_id = _from_json(id_column, position.get("id"))
+            last_value = _from_json(sort_column, position.get("v"))
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+        if direction == "next":
+            condition = id_column > last_id if same_column else or_(
+                sort_column > last_value,
+                and_(sort_column == last_value, id_column > last_id),
+            )
+        else:
+            condition = id_column < last_id if same_column else or_(
+                sort_column < last_value,
+                and_(sort_column == last_value, id_column < last_id),
+            )
+        statement = statement.where(condition)
+
+    if direction == "next":
+        order = [sort_column.asc()] if same_column else [sort_column.asc(), id_column.asc()]
+    else:
+        order = [sort_column.desc()] if same_column else [sort_column.desc(), id_column.desc()]
+
+    statement = statement.order_by(*order).limit(params.limit + 1)
+    result = await session.execute(statement)
+    rows = list(result)
+
+    has_more = len(rows) > params.limit
+    rows = rows[:params.limit]
+    if direction == "prev":
+        rows.reverse()
+
+    items = [row_to_item(row) for row in rows]
+
+    def cursor_for(item: dict, cursor_direction: str) -> str:
+        return encode_cursor({
+            "s": sort,
+            "d": cursor_direction,
+            "v": _to_json(item.get(sort)),
+            "id": _to_json(item.get(id_key)),
+        })
+
+    if direction == "next":
+        has_next, has_prev = has_more, params.cursor is not None
+    else:
+        has_next, has_prev = True, has_more
+
+    return {
+        "items": items,
+        "next_cursor": cursor_for(items[-1], "next") if items and has_next else None,
+        "prev_cursor": cursor_for(items[0], "prev") if items and has_prev else None,
+        "limit": params.limit,
+    }
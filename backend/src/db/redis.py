@@ -1,15 +1,21 @@
 import redis.asyncio as aioredis
 
-from src.config import Settings
+from config import settings
+from metrics import REDIS_COMMAND_DURATION, observe_duration
 
 JTI_SETTINGS = 3600
+REVOKED_PREFIX = "revoked:"
 
-token_blocklists = aioredis.from_url(Settings.REDIS_URL)
+token_blocklists = aioredis.from_url(settings.REDIS_URL)
 
-async def add_token_to_blocklist(jti: str) -> None:
-    await token_blocklists.set(jti, value="", ex=JTI_SETTINGS)
+async def add_token_to_blocklist(jti: str, ttl: int = JTI_SETTINGS, client: aioredis.Redis = None) -> None:
+    client = client or token_blocklists
+    with observe_duration(REDIS_COMMAND_DURATION, "set"):
+        await client.set(f"{REVOKED_PREFIX}{jti}", value="", ex=max(int(ttl), 1))
 
-async def is_token_revoked(jti: str) -> bool:
-    jti = await token_blocklists.get(jti)
+async def is_token_revoked(jti: str, client: aioredis.Redis = None) -> bool:
+    client = client or token_blocklists
+    with observe_duration(REDIS_COMMAND_DURATION, "get"):
+        jti = await client.get(f"{REVOKED_PREFIX}{jti}")
 
-    return jti is not None
\ No newline at end of file
+    return jti is not None
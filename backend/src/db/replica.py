@@ -0,0 +1,134 @@
+import time
+import logging
+from typing import AsyncGenerator, Optional
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from config import settings
+from db.main import async_session_factory, create_db_engine
+
+STICKY_COOKIE = "db_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+logger = logging.getLogger(__name__)
+
+read_engine: Optional[AsyncEngine] = (
+    create_db_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+)
+
+read_session_factory: Optional[async_sessionmaker] = (
+    async_sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None else None
+)
+
+
+class ReplicaHealth:
+    """Caches whether the replica is reachable and within the allowed lag"""
+
+    def __init__(self, engine: AsyncEngine, max_lag: int, check_interval: int):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.available = False
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+
+    async def is_available(self) -> bool:
+        now = time.monotonic()
+        if now - self.checked_at >= self.check_interval:
+            self.checked_at = now
+            self.available = await self._check()
+        return self.available
+
+    async def _check(self) -> bool:
+        try:
+            self.lag = await self._replication_lag()
+        except Exception as e:
+            logger.warning(f"Read replica unavailable: {str(e)}")
+            self.lag = None
+            return False
+
+        if self.lag is None or self.lag > self.max_lag:
+            logger.warning(f"Read replica lagging: {self.lag}s behind primary")
+            return False
+        return True
+
+    async def _replication_lag(self) -> Optional[float]:
+        """Seconds the replica is behind, 0 when it is not replicating"""
+        async with self.engine.connect() as conn:
+            if self.engine.dialect.name != "mysql":
+                await conn.execute(text("SELECT 1"))
+                return 0
+
+            try:
+                result = await conn.execute(text("SHOW REPLICA STATUS"))
+            except Exception:
+                # MySQL older than 8.0.22
+                result = await conn.execute(text("SHOW SLAVE STATUS"))
+            status = result.mappings().first()
+            if status is None:
+                return 0
+            lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+            # NULL means the replication threads are stopped
+            return float(lag) if lag is not None else None
+
+
+replica_health: Optional[ReplicaHealth] = (
+    ReplicaHealth(read_engine, settings.DB_REPLICA_MAX_LAG, settings.DB_REPLICA_CHECK_INTERVAL)
+    if read_engine is not None else None
+)
+
+
+def is_primary_sticky(request: Request) -> bool:
+    """True while the client is inside the read-your-writes window"""
+    until = request.cookies.get(STICKY_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+def mark_primary_sticky(request: Request, response: Response) -> None:
+    """Pin the client's reads to the primary after a successful write"""
+    if read_engine is None or request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+    response.set_cookie(
+        STICKY_COOKIE,
+        str(time.time() + settings.DB_READ_STICKY_SECONDS),
+        max_age=settings.DB_READ_STICKY_SECONDS,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+async def use_replica(request: Request) -> bool:
+    if replica_health is None or is_primary_sticky(request):
+        return False
+    return await replica_health.is_available()
+
+
+async def get_read_session_factory(request: Request) -> async_sessionmaker:
+    """Session factory for read-only work that outlives the request dependencies"""
+    return read_session_factory if await use_replica(request) else async_session_factory
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only handlers, served by the replica when it is healthy"""
+    factory = await get_read_session_factory(request)
+
+    async with factory() as session:
+        try:
+            yield session
+        except Exception as e:
+            logging.error(f"Database session error: {str(e)}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+async def close_read_db() -> None:
+    if read_engine is not None:
+        await read_engine.dispose()
@@ -0,0 +1,30 @@
+import re
+import unicodedata
+from typing import Iterable, List, Optional
+
+# Đ/đ are separate letters rather than D plus a combining mark, so NFD leaves them alone
+_EXTRA_FOLDS = str.maketrans({"đ": "d", "Đ": "d"})
+_NON_WORD = re.compile(r"[^\w@.+-]+")
+
+
+def fold_text(value: Optional[str]) -> str:
+    """Lower-case and strip diacritics, e.g. "Nguyễn Văn Đức" -> "nguyen van duc" """
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFD", value.translate(_EXTRA_FOLDS))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.lower().split())
+
+
+def build_search_text(values: Iterable[Optional[str]], max_length: int) -> str:
+    """Fold and join several fields into one searchable string"""
+    return fold_text(" ".join(v for v in values if v))[:max_length]
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a folded query into terms, dropping punctuation"""
+    return [term for term in _NON_WORD.split(fold_text(query)) if term]
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
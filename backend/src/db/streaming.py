@@ -0,0 +1,160 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config import settings
+from db.xlsx import XlsxStreamWriter
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(item: dict) -> str:
+    return json.dumps(item, default=json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+async def _partitions(
+    factory: async_sessionmaker,
+    statement,
+    row_to_item: Callable[[Any], dict],
+) -> AsyncIterator[List[dict]]:
+    """Yield the items of each server-side cursor batch.
+
+    The session is opened here rather than taken from a dependency so it stays
+    alive for the whole response body. Rows are fetched through a server-side
+    cursor in batches of DB_STREAM_BATCH_SIZE.
+    """
+    statement = statement.execution_options(yield_per=settings.DB_STREAM_BATCH_SIZE)
+    async with factory() as session:
+        result = await session.stream(statement)
+        async for partition in result.partitions():
+            yield [row_to_item(row) for row in partition]
+
+
+async def _json_chunks(partitions: AsyncIterator[List[dict]], fmt: str) -> AsyncIterator[bytes]:
+    first = True
+    if fmt == "json":
+        yield b"["
+    async for items in partitions:
+        lines = [dumps(item) for item in items]
+        if fmt == "json":
+            chunk = ",".join(lines)
+            if not first:
+                chunk = "," + chunk
+        else:
+            chunk = "\n".join(lines) + "\n"
+        first = False
+        yield chunk.encode()
+    if fmt == "json":
+        yield b"]"
+
+
+async def _csv_chunks(partitions: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    # The BOM makes Excel read the file as UTF-8 rather than the local code page
+    yield "\ufeff".encode()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header = None
+    async for items in partitions:
+        for item in items:
+            if header is None:
+                header = list(item)
+                writer.writerow(header)
+            writer.writerow([csv_value(item.get(key)) for key in header])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def _xlsx_chunks(partitions: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    writer: Optional[XlsxStreamWriter] = None
+    async for items in partitions:
+        if not items:
+            continue
+        if writer is None:
+            writer = XlsxStreamWriter(list(items[0]))
+        writer.write_rows([item.get(key) for key in writer.header] for item in items)
+        yield writer.drain()
+    if writer is None:
+        writer = XlsxStreamWriter([])
+    yield writer.close()
+
+
+async def _gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # Sync-flush after each chunk so compression does not hold back the first bytes
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_rows(
+    factory: async_sessionmaker,
+    statement,
+    row_to_item: Callable[[Any], dict],
+    fmt: str = "json",
+) -> AsyncIterator[bytes]:
+    """Encode rows as JSON, NDJSON, CSV or XLSX while the query is still running.
+
+    Each server-side cursor batch is written as one chunk, so memory stays flat
+    and the first bytes go out as soon as the first batch arrives.
+    """
+    partitions = _partitions(factory, statement, row_to_item)
+    if fmt == "csv":
+        return _csv_chunks(partitions)
+    if fmt == "xlsx":
+        return _xlsx_chunks(partitions)
+    return _json_chunks(partitions, fmt)
+
+
+def streaming_response(
+    factory: async_sessionmaker,
+    statement,
+    row_to_item: Callable[[Any], dict],
+    fmt: str = "json",
+    filename: Optional[str] = None,
+    gzip: bool = False,
+) -> StreamingResponse:
+    """Stream a query as a response; spreadsheet formats download as ``filename``"""
+    chunks = stream_rows(factory, statement, row_to_item, fmt)
+    headers = {}
+    if filename and fmt in ("csv", "xlsx"):
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    if gzip:
+        chunks = _gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt], headers=headers)
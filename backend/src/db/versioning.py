@@ -0,0 +1,74 @@
+from typing import Iterable, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, select
+
+from db.counters import TOTAL_KEY
+from db.models import StatCounter
+
+
+def make_etag(*versions: Optional[int]) -> str:
+    """
+    Strong ETag for a response built from rows with the given versions. Caches
+    key validators by URL, and query parameters such as ?fields= are part of
+    it, so the versions alone identify a representation.
+    """
+    return '"' + ".".join(str(version or 0) for version in versions) + '"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    """Whether an If-Match / If-None-Match header lists the ETag"""
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            if not weak:
+                continue
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def not_modified(if_none_match: Optional[str], etag: Optional[str]) -> Optional[Response]:
+    """A 304 response when the client already holds this version, else None"""
+    if etag is not None and etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
+
+
+def check_if_match(if_match: Optional[str], etag: str) -> None:
+    """Reject a write whose If-Match no longer names the current version"""
+    if if_match and not etag_matches(if_match, etag):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="The record has changed since it was read"
+        )
+
+
+def collection_version_statement(
+    model, conditions: Sequence = (), related: Iterable = (), counter: Optional[str] = None
+):
+    """
+    One row holding max(version) and the row count of ``model`` under
+    ``conditions``, then max(version) of each related model whose columns
+    are embedded in the listed rows. With no conditions the count is read
+    from the ``counter`` stat counter, when the table has one.
+    """
+    max_version = select(func.max(model.version)).where(*conditions).scalar_subquery()
+    if counter and not conditions:
+        count = (
+            select(StatCounter.value)
+            .where(StatCounter.metric == counter, StatCounter.key == TOTAL_KEY)
+            .scalar_subquery()
+        )
+    else:
+        count = select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+    return select(
+        max_version,
+        count,
+        *(select(func.max(other.version)).scalar_subquery() for other in related),
+    )
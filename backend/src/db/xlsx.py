@@ -0,0 +1,156 @@
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterable, List, Optional
+from xml.sax.saxutils import escape
+
+# Excel refuses sheets longer than this, header included
+MAX_SHEET_ROWS = 1048576
+
+# Control characters are not allowed in XML 1.0 text
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = "</sheetData></worksheet>"
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, unseekable sink; zipfile then streams entries with data descriptors"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, Enum):
+        value = value.value
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    text = escape(_INVALID_XML_CHARS.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row(values: Iterable[Any]) -> str:
+    return "<row>" + "".join(_cell(value) for value in values) + "</row>"
+
+
+class XlsxStreamWriter:
+    """
+    Writes a minimal XLSX workbook incrementally. Rows go into the zip as they
+    are added and the bytes produced so far are handed back by ``drain``, so
+    memory stays flat however many rows are written. Cells are inline strings
+    or plain numbers, with no styles. A new sheet is started whenever one
+    reaches Excel's row limit.
+    """
+
+    def __init__(self, header: List[str]):
+        self.header = header
+        self._buffer = _ChunkBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheet: Optional[io.BufferedIOBase] = None
+        self._sheet_count = 0
+        self._sheet_rows = 0
+
+    def _open_sheet(self) -> None:
+        self._sheet_count += 1
+        self._sheet = self._zip.open(f"xl/worksheets/sheet{self._sheet_count}.xml", "w", force_zip64=True)
+        self._sheet.write((_SHEET_START + _row(self.header)).encode())
+        self._sheet_rows = 1
+
+    def _close_sheet(self) -> None:
+        self._sheet.write(_SHEET_END.encode())
+        self._sheet.close()
+        self._sheet = None
+
+    def write_rows(self, rows: Iterable[Iterable[Any]]) -> None:
+        parts = []
+        for values in rows:
+            if self._sheet is None or self._sheet_rows >= MAX_SHEET_ROWS:
+                if parts:
+                    self._sheet.write("".join(parts).encode())
+                    parts = []
+                if self._sheet is not None:
+                    self._close_sheet()
+                self._open_sheet()
+            parts.append(_row(values))
+            self._sheet_rows += 1
+        if parts:
+            self._sheet.write("".join(parts).encode())
+
+    def drain(self) -> bytes:
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        """Finish the workbook and return its remaining bytes"""
+        if self._sheet is None and self._sheet_count == 0:
+            self._open_sheet()
+        if self._sheet is not None:
+            self._close_sheet()
+
+        sheets = range(1, self._sheet_count + 1)
+        self._zip.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in sheets
+            )
+            + "</Types>"
+        ))
+        self._zip.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        ))
+        self._zip.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(f'<sheet name="Sheet{i}" sheetId="{i}" r:id="rId{i}"/>' for i in sheets)
+            + "</sheets></workbook>"
+        ))
+        self._zip.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{i}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{i}.xml"/>'
+                for i in sheets
+            )
+            + "</Relationships>"
+        ))
+        self._zip.close()
+        return self.drain()
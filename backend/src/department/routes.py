@@ -4,6 +4,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
 from db.main import get_session
+from db.replica import get_read_session
 from department.schemas import DepartmentCreate, DepartmentUpdateModel
 from department.service import DepartmentService
 from errors import DepartmentAlreadyExists, DepartmentNotFound
@@ -17,7 +18,7 @@ role_checker = Depends(RoleChecker(["admin", "user"]))
 
 @department_router.get("/", response_model=List[dict], dependencies=[role_checker])
 async def get_all_departments(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _: dict = Depends(access_token_bearer),
 ) -> List[dict]:
     """Get all departments"""
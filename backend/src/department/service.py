@@ -1,11 +1,16 @@
 from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
+import logging
 from db.models import Department, Employee
 from department.schemas import DepartmentCreate, DepartmentUpdateModel
 from errors.department_errors import DepartmentNotFound, DepartmentAlreadyExists
+from stats.service import StatsService
 from fastapi import HTTPException, status
 
+logger = logging.getLogger(__name__)
+stats_service = StatsService()
+
 class DepartmentService:
     async def create_department(self, department_data: DepartmentCreate, user_id: str, session: AsyncSession) -> Department:
         """Create a new department"""
@@ -39,7 +44,7 @@ class DepartmentService:
                 departments.append(dept_dict)
             return departments
         except Exception as e:
-            print(f"Error getting departments: {str(e)}")
+            logger.exception("Error getting departments")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to fetch departments"
@@ -88,8 +93,6 @@ class DepartmentService:
 
     async def get_count(self, session: AsyncSession) -> int:
         """Get total number of departments"""
-        result = await session.execute(select(Department))
-        departments = result.scalars().all()
-        return len(departments)
+        return await stats_service.get_counter("departments", session)
     
     
\ No newline at end of file
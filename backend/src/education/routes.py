@@ -1,18 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
+import logging
 from db.main import get_session
+from db.pagination import Page, PageParams
 from education.service import EducationService
 from education.schemas import EducationResponse, EducationCreate
 
+logger = logging.getLogger(__name__)
+
 education_router = APIRouter()
 education_service = EducationService()
 
-@education_router.get("/", response_model=List[EducationResponse])
+@education_router.get("/", response_model=Page[EducationResponse])
 async def get_all_education(
+    params: PageParams = Depends(),
+    session: AsyncSession = Depends(get_session)
+):
+    """Get one page of education records"""
+    return await education_service.get_education_page(params, session)
+
+@education_router.get("/export", response_model=List[EducationResponse])
+async def export_education(
     session: AsyncSession = Depends(get_session)
 ):
-    """Get all education records"""
+    """Get all education records in one response"""
     try:
         education = await education_service.get_all_education(session)
         return education
@@ -40,7 +52,7 @@ async def create_employee_education(
     """Create a new education record for an employee"""
     try:
         education_data = education
-        print(education_data)
+        logger.debug("Creating education record for employee %s", education_data.employee_id)
         new_education = await education_service.create_education(education_data, session)
         return new_education
     except Exception as e:
@@ -2,6 +2,7 @@ from sqlmodel import select, and_
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 from db.models import Education
+from db.pagination import PageParams, paginate
 from education.schemas import EducationCreate
 
 class EducationService:
@@ -12,6 +13,17 @@ class EducationService:
         education = result.scalars().all()
         return list(education)
 
+    async def get_education_page(self, params: PageParams, session: AsyncSession) -> dict:
+        """Get one keyset page of education records"""
+        return await paginate(
+            session,
+            select(Education),
+            params,
+            id_column=Education.id,
+            sort_columns={"id": Education.id, "employee_id": Education.employee_id},
+            row_to_item=lambda row: row[0].model_dump(),
+        )
+
     async def get_employee_education(self, employee_id: int, session: AsyncSession) -> List[Education]:
         """Get all education records for an employee"""
         statement = select(Education).where(Education.employee_id == employee_id)
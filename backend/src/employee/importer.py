@@ -0,0 +1,330 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import settings
+from db.counters import apply_deltas, employee_row_deltas
+from db.main import async_engine
+from db.models import Department, Employee, Position, employee_search_values
+from db.redis import token_blocklists
+from employee.schemas import EmployeeCreate
+from metrics import REDIS_COMMAND_DURATION, observe_duration
+
+logger = logging.getLogger(__name__)
+
+JOB_PREFIX = "import-job:"
+JOB_TTL = 86400  # seconds a finished job stays queryable
+COPY_CHUNK_SIZE = 1024 * 1024
+
+_rows_adapter = TypeAdapter(List[EmployeeCreate])
+
+# (line number in the file, raw row)
+SourceRow = Tuple[int, Dict[str, Optional[str]]]
+
+
+def _clean(row: dict) -> dict:
+    """Drop blank cells so optional fields fall back to their defaults"""
+    cleaned = {}
+    for key, value in row.items():
+        if not isinstance(key, str) or value is None:
+            continue
+        value = value.strip()
+        if value:
+            cleaned[key.strip()] = value
+    return cleaned
+
+
+def _cell_text(value) -> Optional[str]:
+    """A spreadsheet cell as the text a CSV export would hold for it"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_csv_rows(path: str) -> Iterator[SourceRow]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, _clean(row)
+
+
+def read_xlsx_rows(path: str) -> Iterator[SourceRow]:
+    from openpyxl import load_workbook
+
+    # Read-only mode parses the sheet lazily instead of loading it whole
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_cell_text(value) for value in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            row = _clean({name: _cell_text(value) for name, value in zip(header, values)})
+            if row:
+                yield line, row
+    finally:
+        workbook.close()
+
+
+def _take(rows: Iterator[SourceRow], size: int) -> List[SourceRow]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            break
+    return chunk
+
+
+def _validate(chunk: List[SourceRow]) -> Tuple[List[Tuple[int, EmployeeCreate]], List[dict]]:
+    """Validate a chunk in one pass, returning the valid rows and per-row errors"""
+    try:
+        employees = _rows_adapter.validate_python([row for _, row in chunk])
+        return [(line, employee) for (line, _), employee in zip(chunk, employees)], []
+    except ValidationError as e:
+        errors, invalid = [], set()
+        for error in e.errors():
+            index = error["loc"][0]
+            invalid.add(index)
+            errors.append({
+                "row": chunk[index][0],
+                "field": ".".join(str(part) for part in error["loc"][1:]) or None,
+                "message": error["msg"],
+            })
+
+    remaining = [row for index, row in enumerate(chunk) if index not in invalid]
+    employees = _rows_adapter.validate_python([row for _, row in remaining])
+    return [(line, employee) for (line, _), employee in zip(remaining, employees)], errors
+
+
+class ImportJob:
+    def __init__(self, filename: str):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.status = "pending"
+        self.processed = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.message: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def add_errors(self, errors: List[dict]) -> None:
+        self.failed += len({error["row"] for error in errors})
+        room = settings.IMPORT_MAX_ERRORS - len(self.errors)
+        self.errors.extend(errors[:max(0, room)])
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > 0 and len(self.errors) >= settings.IMPORT_MAX_ERRORS,
+            "message": self.message,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ImportJobStore:
+    """
+    Job progress, kept in Redis so whichever worker a status poll lands on
+    can answer it. The worker running a job also keeps a local copy, which
+    is all there is while Redis is unavailable.
+    """
+
+    def __init__(self, redis: aioredis.Redis = None):
+        self.redis = redis or token_blocklists
+        self._local: Dict[str, Tuple[float, dict]] = {}
+
+    async def save(self, job: ImportJob) -> None:
+        now = time.monotonic()
+        for job_id in [k for k, (expires_at, _) in self._local.items() if expires_at <= now]:
+            del self._local[job_id]
+
+        data = job.to_dict()
+        self._local[job.id] = (now + JOB_TTL, data)
+        try:
+            with observe_duration(REDIS_COMMAND_DURATION, "set"):
+                await self.redis.set(f"{JOB_PREFIX}{job.id}", json.dumps(data), ex=JOB_TTL)
+        except Exception as e:
+            logger.warning(f"Could not store import job progress: {str(e)}")
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        entry = self._local.get(job_id)
+        if entry is not None:
+            return entry[1]
+        try:
+            with observe_duration(REDIS_COMMAND_DURATION, "get"):
+                data = await self.redis.get(f"{JOB_PREFIX}{job_id}")
+        except Exception as e:
+            logger.warning(f"Could not read import job progress: {str(e)}")
+            return None
+        return json.loads(data) if data else None
+
+
+class EmployeeImporter:
+    """Imports employees from uploaded CSV/XLSX files in background jobs"""
+
+    def __init__(self, engine: AsyncEngine = None, store: ImportJobStore = None):
+        self.engine = engine or async_engine
+        self.store = store or ImportJobStore()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _format(upload: UploadFile) -> str:
+        extension = os.path.splitext(upload.filename or "")[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension == ".xlsx":
+            try:
+                import openpyxl  # noqa: F401
+            except ImportError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="XLSX import requires the openpyxl package"
+                )
+            return "xlsx"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload a .csv or .xlsx file"
+        )
+
+    async def start(self, upload: UploadFile) -> dict:
+        """Spool the upload to disk and import it in the background"""
+        file_format = self._format(upload)
+        fd, path = tempfile.mkstemp(prefix="employee-import-", suffix=f".{file_format}")
+        try:
+            with os.fdopen(fd, "wb") as spooled:
+                await run_in_threadpool(shutil.copyfileobj, upload.file, spooled, COPY_CHUNK_SIZE)
+        except Exception:
+            os.remove(path)
+            raise
+
+        job = ImportJob(upload.filename)
+        await self.store.save(job)
+        task = asyncio.create_task(self._run(job, path, file_format))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job.to_dict()
+
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        return await self.store.get(job_id)
+
+    async def _load_references(self) -> Tuple[set, set, set]:
+        async with self.engine.connect() as conn:
+            codes = set((await conn.execute(select(Employee.employee_code))).scalars())
+            departments = set((await conn.execute(select(Department.id))).scalars())
+            positions = set((await conn.execute(select(Position.id))).scalars())
+        return codes, departments, positions
+
+    async def _insert(self, job: ImportJob, records: List[Tuple[int, dict]]) -> None:
+        """Insert one batch as a multi-row INSERT, isolating rows if it conflicts"""
+        if not records:
+            return
+        table = Employee.__table__
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(insert(table), [row for _, row in records])
+                await conn.run_sync(apply_deltas, employee_row_deltas(row for _, row in records))
+            job.inserted += len(records)
+            return
+        except IntegrityError:
+            # Something written since the references were loaded; retry row by row
+            pass
+
+        errors = []
+        for line, row in records:
+            try:
+                async with self.engine.begin() as conn:
+                    await conn.execute(insert(table), [row])
+                    await conn.run_sync(apply_deltas, employee_row_deltas([row]))
+                job.inserted += 1
+            except IntegrityError:
+                errors.append({"row": line, "field": None, "message": "Conflicts with an existing record"})
+        job.add_errors(errors)
+
+    async def _run(self, job: ImportJob, path: str, file_format: str) -> None:
+        rows = read_csv_rows(path) if file_format == "csv" else read_xlsx_rows(path)
+        started = time.perf_counter()
+        try:
+            job.status = "running"
+            await self.store.save(job)
+            codes, departments, positions = await self._load_references()
+
+            while True:
+                # Parsing and validation are CPU bound, so keep them off the event loop
+                chunk = await run_in_threadpool(_take, rows, settings.IMPORT_BATCH_SIZE)
+                if not chunk:
+                    break
+                valid, errors = await run_in_threadpool(_validate, chunk)
+
+                records = []
+                for line, employee in valid:
+                    if employee.employee_code in codes:
+                        errors.append({"row": line, "field": "employee_code", "message": "Employee code already exists"})
+                    elif employee.department_id not in departments:
+                        errors.append({"row": line, "field": "department_id", "message": "Department not found"})
+                    elif employee.position_id not in positions:
+                        errors.append({"row": line, "field": "position_id", "message": "Position not found"})
+                    else:
+                        codes.add(employee.employee_code)
+                        row = employee.model_dump()
+                        row.update(employee_search_values(row))
+                        records.append((line, row))
+
+                job.add_errors(sorted(errors, key=lambda error: error["row"]))
+                await self._insert(job, records)
+                job.processed += len(chunk)
+                await self.store.save(job)
+
+            job.status = "completed"
+            logger.info(
+                f"Imported {job.inserted} employees from {job.filename}, {job.failed} rows rejected, "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        except asyncio.CancelledError:
+            job.status, job.message = "failed", "Interrupted by shutdown"
+            raise
+        except Exception as e:
+            logger.exception(f"Employee import {job.id} failed")
+            job.status, job.message = "failed", str(e)
+        finally:
+            rows.close()
+            os.remove(path)
+            job.finished_at = datetime.utcnow()
+            await self.store.save(job)
+
+    async def stop(self) -> None:
+        """Cancel imports still running at shutdown"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+employee_importer = EmployeeImporter()
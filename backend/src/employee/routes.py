@@ -1,19 +1,31 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, status, HTTPException, Header, Query, Response, UploadFile, File
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlmodel import select, Session as AsyncSession
-from typing import List
+from fastapi.encoders import jsonable_encoder
+from typing import List, Literal, Optional
 from sqlalchemy import func
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from db.instrumentation import QueryBudget
 from db.main import get_session
+from db.replica import get_read_session, get_read_session_factory
+from db.streaming import streaming_response
+from db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page, PageParams
+from db.versioning import check_if_match, not_modified
 from employee.schemas import (
     EmployeeCreate, 
     EmployeeUpdateModel, 
     ContractCreate, 
     ContractUpdate, 
     ContractResponse,
-    PositionRead
+    EmployeeFilters,
+    EmployeeBatchRequest,
+    PositionRead,
+    EMPLOYEE_SEARCH_RESULT_FIELDS
 )
 from employee.service import EmployeeService
+from employee.importer import employee_importer
+from media.service import image_store
 from errors.employee_errors import EmployeeAlreadyExists, EmployeeNotFound
 from db.models import Employee, Position
 from auth.dependencies import AccessTokenBearer, RoleChecker
@@ -24,14 +36,118 @@ access_token_bearer = AccessTokenBearer()
 role_checker = Depends(RoleChecker(["admin", "user"]))
 
 
-@employee_router.get("/", response_model=List[dict])
+@employee_router.get("/", response_model=Page[dict], dependencies=[Depends(QueryBudget(2))])
 async def get_all_employees(
-    session: AsyncSession = Depends(get_session),
+    response: Response,
+    params: PageParams = Depends(),
+    filters: EmployeeFilters = Depends(),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    """Get one filtered page of employees"""
+    role = token_details.get("user")["role"]
+    selected = employee_service.resolve_fields(fields, role)
+    employee_service.check_list_access(params.sort, filters, role)
+    etag = await employee_service.get_employees_etag(session, selected, filters)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+
+    response.headers["ETag"] = etag
+    return await employee_service.get_employees_page(params, session, selected, filters)
+
+@employee_router.get(
+    "/export", response_class=StreamingResponse, dependencies=[role_checker, Depends(QueryBudget(1))]
+)
+async def export_employees(
+    format: Literal["json", "ndjson", "csv", "xlsx"] = Query("json"),
+    gzip: bool = Query(False, description="Compress the response with Content-Encoding: gzip"),
+    factory: async_sessionmaker = Depends(get_read_session_factory),
+    token_details: dict = Depends(access_token_bearer),
+) -> StreamingResponse:
+    """Stream all employees with position and department names, limited to the fields the role may see"""
+    selected = employee_service.resolve_fields(None, token_details.get("user")["role"])
+    return streaming_response(
+        factory,
+        employee_service.employee_stream_statement(selected),
+        employee_service.employee_stream_row,
+        format,
+        filename="employees",
+        gzip=gzip,
+    )
+
+@employee_router.get("/search", response_model=Page[dict], dependencies=[role_checker, Depends(QueryBudget(1))])
+async def search_employees(
+    q: str = Query(..., min_length=2, max_length=100, description="Name, code, email, phone or ID number"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    session: AsyncSession = Depends(get_read_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    """Search employees ignoring case and Vietnamese diacritics, best match first"""
+    role = token_details.get("user")["role"]
+    selected = employee_service.resolve_fields(fields, role, EMPLOYEE_SEARCH_RESULT_FIELDS)
+    return await employee_service.search_employees(q, limit, cursor, session, selected, role)
+
+@employee_router.get("/batch", dependencies=[role_checker, Depends(QueryBudget(1))])
+async def get_employees_batch(
+    ids: Optional[str] = Query(None, description="Comma separated employee ids"),
+    codes: Optional[str] = Query(None, description="Comma separated employee codes"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    session: AsyncSession = Depends(get_read_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    """Get many employees at once, keyed by id, with the ids and codes that were not found"""
+    try:
+        id_list = [int(i) for i in (ids or "").split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma separated integers"
+        )
+    code_list = (codes or "").split(",")
+    selected = employee_service.resolve_fields(
+        fields, token_details.get("user")["role"], EMPLOYEE_SEARCH_RESULT_FIELDS
+    )
+    return await employee_service.get_employees_batch(id_list, code_list, session, selected)
+
+@employee_router.post("/batch", dependencies=[role_checker, Depends(QueryBudget(1))])
+async def post_employees_batch(
+    batch: EmployeeBatchRequest,
+    session: AsyncSession = Depends(get_read_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    """Same as GET /batch, for id lists too long for a URL"""
+    fields = ",".join(batch.fields) if batch.fields else None
+    selected = employee_service.resolve_fields(
+        fields, token_details.get("user")["role"], EMPLOYEE_SEARCH_RESULT_FIELDS
+    )
+    return await employee_service.get_employees_batch(batch.ids, batch.codes, session, selected)
+
+@employee_router.post("/import", status_code=status.HTTP_202_ACCEPTED, dependencies=[role_checker])
+async def import_employees(
+    file: UploadFile = File(..., description="CSV or XLSX file with an EmployeeCreate header row"),
     _: dict = Depends(access_token_bearer),
-) -> List[dict]:
-    """Get all employees"""
-    employees = await employee_service.get_all_employees(session)
-    return employees
+) -> dict:
+    """Start importing employees from a spreadsheet; poll the returned job for progress"""
+    return await employee_importer.start(file)
+
+@employee_router.get("/import/{job_id}", dependencies=[role_checker])
+async def get_import_job(
+    job_id: str,
+    _: dict = Depends(access_token_bearer),
+) -> dict:
+    """Get the progress and row errors of an import job"""
+    job = await employee_importer.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return job
 
 @employee_router.post("/",
     status_code=status.HTTP_201_CREATED,
@@ -47,26 +163,74 @@ async def create_employee(
     user_id = token_details.get("user")["uid"]
     return await employee_service.create_employee(employee_data, user_id, session)
 
-@employee_router.get("/{employee_id}", response_model=Employee, dependencies=[role_checker])
+@employee_router.get(
+    "/{employee_id}", response_model=Employee, dependencies=[role_checker, Depends(QueryBudget(2))]
+)
 async def get_employee_by_id(
     employee_id: str,
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
-    _: dict = Depends(access_token_bearer),
+    token_details: dict = Depends(access_token_bearer),
 ) -> Employee:
-    """Get employee by ID"""
-    employee = await employee_service.get_employee_by_id(employee_id, session)
-    
-    return employee if employee else JSONResponse(content={"message": "Employee not found"}, status_code=status.HTTP_404_NOT_FOUND)
+    """Get employee by ID; answers 304 when If-None-Match names the current version"""
+    selected = employee_service.resolve_fields(fields, token_details.get("user")["role"])
+    # Only the version columns are read until the client turns out to need the body
+    etag = await employee_service.get_employee_etag(employee_id, session, selected)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+
+    employee = await employee_service.get_employee_fields(employee_id, selected, session)
+    return JSONResponse(content=jsonable_encoder(employee), headers={"ETag": etag})
 
 @employee_router.patch("/{employee_id}", response_model=Employee, dependencies=[role_checker])
 async def update_employee(
     employee_id: str,
     employee_data: EmployeeUpdateModel,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Fields of the GET whose ETag is sent in If-Match"),
+    if_match: Optional[str] = Header(None, description="ETag the update is based on; 412 if it is stale"),
     session: AsyncSession = Depends(get_session),
-    _: dict = Depends(access_token_bearer),
+    token_details: dict = Depends(access_token_bearer),
 ) -> Employee:
     """Update an employee"""
-    return await employee_service.update_employee(employee_id, employee_data, session)
+    selected = employee_service.resolve_fields(fields, token_details.get("user")["role"])
+    employee = await employee_service.update_employee(employee_id, employee_data, session, if_match, selected)
+    # The same ETag a GET with these fields now returns
+    response.headers["ETag"] = await employee_service.get_employee_etag(employee_id, session, selected)
+    return employee
+
+@employee_router.post("/{employee_id}/profile-image", dependencies=[role_checker])
+async def upload_profile_image(
+    employee_id: str,
+    response: Response,
+    file: UploadFile = File(..., description="JPEG, PNG, WEBP or GIF image"),
+    fields: Optional[str] = Query(None, description="Fields of the GET whose ETag is sent in If-Match"),
+    if_match: Optional[str] = Header(None, description="ETag the update is based on; 412 if it is stale"),
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    """Store a profile image with its thumbnails and set it on the employee"""
+    selected = employee_service.resolve_fields(fields, token_details.get("user")["role"])
+    etag = await employee_service.get_employee_etag(employee_id, session, selected)
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found"
+        )
+    # Fail a stale upload before the image is processed; the update checks again
+    if if_match:
+        check_if_match(if_match, etag)
+    # Give the connection back while the image is processed
+    await session.commit()
+
+    name = await image_store.save(file)
+    await employee_service.update_employee(
+        employee_id, EmployeeUpdateModel(profile_image_path=name), session, if_match, selected
+    )
+    response.headers["ETag"] = await employee_service.get_employee_etag(employee_id, session, selected)
+    return {"profile_image_path": name, **image_store.urls(name)}
 
 @employee_router.delete("/{employee_id}", dependencies=[role_checker])
 async def delete_employee(
@@ -98,6 +262,23 @@ async def create_contract(
     contract_dict = await employee_service.create_contract(contract_data, user_id, session)
     return ContractResponse(**contract_dict)
 
+@employee_router.get("/contracts/export", response_class=StreamingResponse)
+async def export_contracts(
+    format: Literal["json", "ndjson", "csv", "xlsx"] = Query("json"),
+    gzip: bool = Query(False, description="Compress the response with Content-Encoding: gzip"),
+    factory: async_sessionmaker = Depends(get_read_session_factory),
+    token_details: dict = Depends(access_token_bearer),
+) -> StreamingResponse:
+    """Stream all contracts with employee names"""
+    return streaming_response(
+        factory,
+        employee_service.contract_stream_statement(),
+        employee_service.contract_stream_row,
+        format,
+        filename="contracts",
+        gzip=gzip,
+    )
+
 @employee_router.get("/contracts/{employee_id}", response_model=List[ContractResponse])
 async def get_employee_contracts(
     employee_id: str,
@@ -111,23 +292,35 @@ async def get_employee_contracts(
 @employee_router.get("/contracts/detail/{contract_id}", response_model=ContractResponse)
 async def get_contract(
     contract_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
     token_details: dict = Depends(access_token_bearer),
 ):
-    """Get a specific contract by ID"""
-    user_id = token_details.get("user")["uid"]
-    return await employee_service.get_contract_by_id(contract_id, user_id, session)
+    """Get a specific contract by ID; answers 304 when If-None-Match names the current version"""
+    etag = await employee_service.get_contract_etag(contract_id, session)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+
+    contract = await employee_service.get_contract_detail(contract_id, session)
+    response.headers["ETag"] = etag
+    return contract
 
 @employee_router.put("/contracts/{contract_id}", response_model=ContractResponse, dependencies=[role_checker])
 async def update_contract(
     contract_id: int,
     contract_data: ContractUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag the update is based on; 412 if it is stale"),
     session: AsyncSession = Depends(get_session),
     token_details: dict = Depends(access_token_bearer),
 ):
     """Update a contract"""
     user_id = token_details.get("user")["uid"]
-    return await employee_service.update_contract(contract_id, contract_data, user_id, session)
+    contract = await employee_service.update_contract(contract_id, contract_data, user_id, session, if_match)
+    response.headers["ETag"] = await employee_service.get_contract_etag(contract_id, session)
+    return contract
 
 @employee_router.delete("/contracts/{contract_id}")
 async def delete_contract(
@@ -140,17 +333,26 @@ async def delete_contract(
     return await employee_service.delete_contract(contract_id, user_id, session)
 
 
-@employee_router.get("/contracts/", response_model=List[ContractResponse])
+@employee_router.get("/contracts/", response_model=Page[ContractResponse])
 async def get_all_contracts(
-    session: AsyncSession = Depends(get_session),
+    response: Response,
+    params: PageParams = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
     token_details: dict = Depends(access_token_bearer),
 ):
-    """Get all contracts"""
-    return await employee_service.get_all_contracts(session)
+    """Get one page of contracts"""
+    etag = await employee_service.get_contracts_etag(session)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+
+    response.headers["ETag"] = etag
+    return await employee_service.get_contracts_page(params, session)
 
 @employee_router.get("/positions/", response_model=List[PositionRead])
 async def get_positions(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _: dict = Depends(access_token_bearer)
 ):
     """Get all positions with employee count"""
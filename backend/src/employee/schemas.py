@@ -1,5 +1,6 @@
 from datetime import date, datetime
 from typing import Optional, List
+from fastapi import Query
 from pydantic import BaseModel, EmailStr, Field
 from db.models import Gender, MaritalStatus
 
@@ -95,4 +96,72 @@ class PositionRead(BaseModel):
     employee_count: int = 0
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+# Fields selectable through ?fields=, per role. "Position" and "Department"
+# are the joined position title and department name.
+EMPLOYEE_USER_FIELDS = {
+    "id", "employee_code", "full_name", "position_id", "department_id",
+    "gender", "email", "phone", "marital_status", "profile_image_path",
+    "Position", "Department",
+}
+
+EMPLOYEE_ADMIN_FIELDS = EMPLOYEE_USER_FIELDS | {
+    "salary", "contract_id", "birth_date", "birth_place", "id_number",
+    "address", "ethnicity", "education_level_id", "id_card_date",
+    "id_card_place", "health_insurance_number", "social_insurance_number",
+}
+
+EMPLOYEE_FIELDS_BY_ROLE = {
+    "user": EMPLOYEE_USER_FIELDS,
+    "admin": EMPLOYEE_ADMIN_FIELDS,
+}
+
+# Returned by /employee/search and /employee/batch unless fields are given
+EMPLOYEE_SEARCH_RESULT_FIELDS = [
+    "id", "employee_code", "full_name", "email", "phone", "Position", "Department",
+]
+
+# Ids plus employee codes accepted by one /employee/batch request
+EMPLOYEE_BATCH_MAX_SIZE = 200
+
+
+class EmployeeBatchRequest(BaseModel):
+    ids: List[int] = Field(default_factory=list, max_length=EMPLOYEE_BATCH_MAX_SIZE)
+    codes: List[str] = Field(default_factory=list, max_length=EMPLOYEE_BATCH_MAX_SIZE)
+    fields: Optional[List[str]] = None
+
+
+class EmployeeFilters:
+    """Query parameters filtering the employee list, each backed by an index"""
+
+    def __init__(
+        self,
+        department_id: Optional[int] = Query(None),
+        position_id: Optional[int] = Query(None),
+        gender: Optional[Gender] = Query(None),
+        marital_status: Optional[MaritalStatus] = Query(None),
+        salary_min: Optional[float] = Query(None, ge=0),
+        salary_max: Optional[float] = Query(None, ge=0),
+        birth_date_from: Optional[date] = Query(None),
+        birth_date_to: Optional[date] = Query(None),
+    ):
+        self.department_id = department_id
+        self.position_id = position_id
+        self.gender = gender
+        self.marital_status = marital_status
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.birth_date_from = birth_date_from
+        self.birth_date_to = birth_date_to
+
+    def columns(self) -> List[str]:
+        """Employee columns compared by the filters that were given"""
+        given = {
+            "department_id": [self.department_id],
+            "position_id": [self.position_id],
+            "gender": [self.gender],
+            "marital_status": [self.marital_status],
+            "salary": [self.salary_min, self.salary_max],
+            "birth_date": [self.birth_date_from, self.birth_date_to],
+        }
+        return [column for column, values in given.items() if any(v is not None for v in values)]
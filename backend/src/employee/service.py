@@ -1,12 +1,40 @@
+from sqlalchemy import Float, and_, case, or_, type_coerce, union
+from sqlalchemy.dialects import mysql
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
 from datetime import datetime
+from decimal import Decimal
+import logging
 from fastapi import HTTPException, status
 
 from db.models import Employee, Position, Department, Contract
-from employee.schemas import EmployeeCreate, EmployeeUpdateModel, ContractCreate, ContractUpdate
+from db.pagination import PageParams, decode_cursor, encode_cursor, paginate
+from db.search import escape_like, fold_text, search_terms
+from db.versioning import check_if_match, collection_version_statement, make_etag
+from employee.schemas import (
+    EmployeeCreate,
+    EmployeeUpdateModel,
+    ContractCreate,
+    ContractUpdate,
+    EmployeeFilters,
+    EMPLOYEE_FIELDS_BY_ROLE,
+    EMPLOYEE_SEARCH_RESULT_FIELDS,
+    EMPLOYEE_BATCH_MAX_SIZE
+)
 from errors.employee_errors import EmployeeNotFound, ContractNotFound
+from stats.service import StatsService
+
+logger = logging.getLogger(__name__)
+stats_service = StatsService()
+
+# Columns the employee list may be sorted by, each indexed on its own
+EMPLOYEE_SORT_COLUMNS = {
+    "id": Employee.id,
+    "employee_code": Employee.employee_code,
+    "salary": Employee.salary,
+    "birth_date": Employee.birth_date,
+}
 
 class EmployeeService:
     async def create_employee(self, employee_data: EmployeeCreate, uid: str, session: AsyncSession) -> Employee:
@@ -22,9 +50,8 @@ class EmployeeService:
         await session.refresh(new_employee)
         return new_employee
     
-    async def get_all_employees(self, session: AsyncSession) -> List[dict]:
-        """Get all employees with their position and department"""
-        statement = (
+    def _employee_list_statement(self):
+        return (
             select(
                 Employee,
                 Position.title,
@@ -33,23 +60,297 @@ class EmployeeService:
             .outerjoin(Position, Employee.position_id == Position.id)
             .outerjoin(Department, Employee.department_id == Department.id)
         )
-        
+
+    @staticmethod
+    def _employee_list_row(row) -> dict:
+        emp, position_name, dept_name = row
+        emp_dict = emp.dict()
+        emp_dict.update({
+            'Position': position_name or 'N/A',
+            'Department': dept_name or 'N/A'
+        })
+        return emp_dict
+
+    def employee_stream_statement(self, fields: Optional[List[str]] = None):
+        """Column-only employee listing for server-side cursor streaming"""
+        if fields is not None:
+            return self._projection_statement(fields).order_by(Employee.id)
+        return (
+            select(
+                *(c for c in Employee.__table__.columns if not c.name.startswith('search_')),
+                Position.title.label('Position'),
+                Department.name.label('Department'),
+            )
+            .outerjoin(Position, Employee.position_id == Position.id)
+            .outerjoin(Department, Employee.department_id == Department.id)
+            .order_by(Employee.id)
+        )
+
+    @staticmethod
+    def employee_stream_row(row) -> dict:
+        emp_dict = dict(row._mapping)
+        for key in ('Position', 'Department'):
+            if key in emp_dict:
+                emp_dict[key] = emp_dict[key] or 'N/A'
+        return emp_dict
+
+    def resolve_fields(self, fields: Optional[str], role: str, default: Optional[List[str]] = None) -> List[str]:
+        """
+        Parse a comma separated ?fields= value against the role's allow-list.
+        Without one, the role gets ``default`` or else every field it may see,
+        never the whole row.
+        """
+        allowed = EMPLOYEE_FIELDS_BY_ROLE.get(role, set())
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No employee fields are available to this role"
+            )
+
+        requested = list(dict.fromkeys(f.strip() for f in (fields or "").split(",") if f.strip()))
+        if not requested:
+            if default is not None:
+                return [f for f in default if f in allowed]
+            columns = [c.name for c in Employee.__table__.columns if c.name in allowed]
+            return columns + [f for f in ("Position", "Department") if f in allowed]
+
+        rejected = [f for f in requested if f not in allowed]
+        if rejected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Fields not available: {', '.join(rejected)}"
+            )
+        return requested
+
+    def check_list_access(self, sort: Optional[str], filters: Optional[EmployeeFilters], role: str) -> None:
+        """
+        Reject sorting or filtering by a column the role may not see; the
+        order of the results or the cursor would reveal its values
+        """
+        allowed = EMPLOYEE_FIELDS_BY_ROLE.get(role, set())
+        if sort in EMPLOYEE_SORT_COLUMNS and sort not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot sort by '{sort}'"
+            )
+
+        rejected = [c for c in (filters.columns() if filters is not None else []) if c not in allowed]
+        if rejected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot filter by: {', '.join(rejected)}"
+            )
+
+    def _projection_statement(self, fields: List[str]):
+        """Column-only select of the requested fields, joining only what is needed"""
+        columns = []
+        for field in fields:
+            if field == 'Position':
+                columns.append(Position.title.label('Position'))
+            elif field == 'Department':
+                columns.append(Department.name.label('Department'))
+            else:
+                columns.append(Employee.__table__.c[field])
+
+        statement = select(*columns).select_from(Employee)
+        if 'Position' in fields:
+            statement = statement.outerjoin(Position, Employee.position_id == Position.id)
+        if 'Department' in fields:
+            statement = statement.outerjoin(Department, Employee.department_id == Department.id)
+        return statement
+
+    @staticmethod
+    def _projection_row(row) -> dict:
+        emp_dict = {}
+        for key, value in row._mapping.items():
+            if isinstance(value, Decimal):
+                value = float(value)
+            elif key in ('Position', 'Department'):
+                value = value or 'N/A'
+            emp_dict[key] = value
+        return emp_dict
+
+    @staticmethod
+    def _filter_conditions(filters: EmployeeFilters) -> list:
+        """WHERE clauses for the list filters that were given"""
+        for low, high, name in (
+            (filters.salary_min, filters.salary_max, "salary"),
+            (filters.birth_date_from, filters.birth_date_to, "birth date"),
+        ):
+            if low is not None and high is not None and low > high:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid {name} range"
+                )
+
+        conditions = []
+        if filters.department_id is not None:
+            conditions.append(Employee.department_id == filters.department_id)
+        if filters.position_id is not None:
+            conditions.append(Employee.position_id == filters.position_id)
+        if filters.gender is not None:
+            conditions.append(Employee.gender == filters.gender)
+        if filters.marital_status is not None:
+            conditions.append(Employee.marital_status == filters.marital_status)
+        if filters.salary_min is not None:
+            conditions.append(Employee.salary >= filters.salary_min)
+        if filters.salary_max is not None:
+            conditions.append(Employee.salary <= filters.salary_max)
+        if filters.birth_date_from is not None:
+            conditions.append(Employee.birth_date >= filters.birth_date_from)
+        if filters.birth_date_to is not None:
+            conditions.append(Employee.birth_date <= filters.birth_date_to)
+        return conditions
+
+    @staticmethod
+    def _cursor_keys(params: PageParams, fields: List[str]) -> List[str]:
+        """Columns the cursor is built from that the caller did not ask for"""
+        return [k for k in ("id", params.sort) if k in EMPLOYEE_SORT_COLUMNS and k not in fields]
+
+    def employees_page_statement(
+        self, params: PageParams, filters: Optional[EmployeeFilters] = None, fields: Optional[List[str]] = None
+    ):
+        """Filtered list statement for a page, before keyset conditions and ordering"""
+        if fields is None:
+            statement = self._employee_list_statement()
+        else:
+            statement = self._projection_statement(self._cursor_keys(params, fields) + fields)
+
+        if filters is not None:
+            conditions = self._filter_conditions(filters)
+            if conditions:
+                statement = statement.where(*conditions)
+        return statement
+
+    @staticmethod
+    def _related_models(fields: Optional[List[str]]) -> list:
+        """Models whose columns a response with these fields embeds"""
+        related = {"Position": Position, "Department": Department}
+        return [model for name, model in related.items() if fields is None or name in fields]
+
+    async def get_employees_etag(
+        self, session: AsyncSession, fields: Optional[List[str]] = None, filters: Optional[EmployeeFilters] = None
+    ) -> str:
+        """ETag of the filtered employee list, from max(version) and count instead of the rows"""
+        conditions = self._filter_conditions(filters) if filters is not None else []
+        statement = collection_version_statement(
+            Employee, conditions, self._related_models(fields), counter="employees"
+        )
         result = await session.execute(statement)
-        employees = []
-        
-        for emp, position_name, dept_name in result:
-            emp_dict = emp.dict()
-            emp_dict.update({
-                'Position': position_name or 'N/A',
-                'Department': dept_name or 'N/A'
-            })
-            employees.append(emp_dict)
-            
-        return employees
+        return make_etag(*result.one())
+
+    async def get_employees_page(
+        self, params: PageParams, session: AsyncSession, fields: Optional[List[str]] = None,
+        filters: Optional[EmployeeFilters] = None
+    ) -> dict:
+        """Get one keyset page of employees with their position and department"""
+        statement = self.employees_page_statement(params, filters, fields)
+        row_to_item = self._employee_list_row if fields is None else self._projection_row
+
+        page = await paginate(
+            session,
+            statement,
+            params,
+            id_column=Employee.id,
+            sort_columns=EMPLOYEE_SORT_COLUMNS,
+            row_to_item=row_to_item,
+        )
+
+        # The cursors are built by now, so drop the keys that were only projected for them
+        if fields is not None:
+            hidden = self._cursor_keys(params, fields)
+            for item in page["items"]:
+                for key in hidden:
+                    del item[key]
+        return page
+
+    def _search_statement(
+        self, query: str, terms: List[str], dialect: str, fields: List[str], match_id_number: bool = False
+    ):
+        """Ranked match of the folded query against the search columns"""
+        raw, folded = query.strip(), fold_text(query)
+        identifiers = [Employee.employee_code == raw, Employee.phone == raw]
+        if match_id_number:
+            identifiers.append(Employee.id_number == raw)
+        # Exact identifiers first, then names equal to or starting with the query
+        score = (
+            case((or_(*identifiers), 100), else_=0)
+            + case((Employee.search_name == folded, 50), else_=0)
+            + case((Employee.search_name.like(f"{escape_like(folded)}%", escape="\\"), 20), else_=0)
+        )
+
+        if dialect == "mysql":
+            # Quoted terms are phrase searches, which the ngram parser splits into ngrams
+            relevance = type_coerce(
+                mysql.match(Employee.search_text, against=" ".join(f'+"{term}"' for term in terms)).in_boolean_mode(),
+                Float,
+            )
+            condition, score = relevance > 0, score + relevance
+        else:
+            condition = and_(*(
+                Employee.search_text.like(f"%{escape_like(term)}%", escape="\\") for term in terms
+            ))
+
+        if match_id_number:
+            # A union keeps each branch on its own index, where OR would scan the table
+            condition = Employee.id.in_(union(
+                select(Employee.id).where(condition),
+                select(Employee.id).where(Employee.id_number == raw),
+            ))
+
+        return (
+            self._projection_statement(fields)
+            .where(condition)
+            .order_by(score.desc(), Employee.id)
+        )
+
+    async def search_employees(
+        self, query: str, limit: int, cursor: Optional[str], session: AsyncSession,
+        fields: Optional[List[str]] = None, role: Optional[str] = None
+    ) -> dict:
+        """
+        Get one page of employees matching a diacritic-insensitive query, best
+        match first. ID numbers are only matched for roles that may see them.
+        """
+        terms = search_terms(query)
+        if not terms:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search query has no searchable characters"
+            )
+
+        # Ranked results have no stable keyset, so the cursor carries an offset
+        # bound to the query it was issued for
+        folded = " ".join(terms)
+        offset = 0
+        if cursor:
+            position = decode_cursor(cursor)
+            offset = position.get("o")
+            if position.get("q") != folded or not isinstance(offset, int) or offset < 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+
+        selected = fields or EMPLOYEE_SEARCH_RESULT_FIELDS
+        match_id_number = "id_number" in EMPLOYEE_FIELDS_BY_ROLE.get(role, set())
+        statement = self._search_statement(query, terms, session.bind.dialect.name, selected, match_id_number)
+        result = await session.execute(statement.offset(offset).limit(limit + 1))
+        rows = list(result)
+        items = [self._projection_row(row) for row in rows[:limit]]
+
+        def cursor_for(direction: str, at: int) -> str:
+            return encode_cursor({"d": direction, "q": folded, "o": at})
+
+        return {
+            "items": items,
+            "next_cursor": cursor_for("next", offset + limit) if len(rows) > limit else None,
+            "prev_cursor": cursor_for("prev", max(0, offset - limit)) if offset > 0 else None,
+            "limit": limit,
+        }
 
     async def get_employee_by_id(self, employee_id: str, session: AsyncSession) -> Optional[Employee]:
         """Get employee by ID"""
-        print("employee_id: ", employee_id)
         statement = select(Employee).where(Employee.id == employee_id)
         result = await session.execute(statement)
         employee = result.scalar_one_or_none()
@@ -57,17 +358,87 @@ class EmployeeService:
             raise EmployeeNotFound()
         return employee
 
+    async def get_employee_fields(self, employee_id: str, fields: List[str], session: AsyncSession) -> dict:
+        """Get the requested fields of one employee without loading the entity"""
+        statement = self._projection_statement(fields).where(Employee.id == employee_id)
+        result = await session.execute(statement)
+        row = result.first()
+        if not row:
+            raise EmployeeNotFound()
+        return self._projection_row(row)
+
+    async def get_employee_etag(
+        self, employee_id: str, session: AsyncSession, fields: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """ETag of an employee response from a primary key lookup, or None if there is no such employee"""
+        statement = select(Employee.version).where(Employee.id == employee_id)
+        for model in self._related_models(fields or []):
+            foreign_key = Employee.position_id if model is Position else Employee.department_id
+            statement = statement.add_columns(model.version).outerjoin(model, foreign_key == model.id)
+        result = await session.execute(statement)
+        row = result.first()
+        return make_etag(*row) if row else None
+
+    async def get_employees_batch(
+        self, ids: List[int], codes: List[str], session: AsyncSession, fields: Optional[List[str]] = None
+    ) -> dict:
+        """Resolve many employees by id or employee code in one IN (...) query, keyed by id"""
+        ids = list(dict.fromkeys(ids))
+        codes = list(dict.fromkeys(code.strip() for code in codes if code.strip()))
+        if not ids and not codes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Give at least one id or employee code"
+            )
+        if len(ids) + len(codes) > EMPLOYEE_BATCH_MAX_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {EMPLOYEE_BATCH_MAX_SIZE} ids and codes per request"
+            )
+
+        fields = fields or EMPLOYEE_SEARCH_RESULT_FIELDS
+        # Both keys are needed to tell which of the requested employees were found
+        keys = [k for k in ("id", "employee_code") if k not in fields]
+        conditions = []
+        if ids:
+            conditions.append(Employee.id.in_(ids))
+        if codes:
+            conditions.append(Employee.employee_code.in_(codes))
+        statement = self._projection_statement(keys + fields).where(or_(*conditions))
+        result = await session.execute(statement)
+
+        items = {}
+        for row in result:
+            item = self._projection_row(row)
+            items[item["id"]] = item
+        found_codes = {item["employee_code"] for item in items.values()}
+        return {
+            "items": items,
+            "missing_ids": [i for i in ids if i not in items],
+            "missing_codes": [code for code in codes if code not in found_codes],
+        }
+
     async def employee_exists(self, employee_id: str, session: AsyncSession) -> bool:
         """Check if employee exists"""
         statement = select(Employee).where(Employee.id == employee_id)
         result = await session.execute(statement)
         return result.scalar_one_or_none() is not None
     
-    async def update_employee(self, employee_id: str, employee_data: EmployeeUpdateModel, session: AsyncSession) -> Employee:
-        """Update an employee"""
+    async def update_employee(
+        self, employee_id: str, employee_data: EmployeeUpdateModel, session: AsyncSession,
+        if_match: Optional[str] = None, fields: Optional[List[str]] = None
+    ) -> Employee:
+        """
+        Update an employee, if it is still at the version named by If-Match.
+        ``fields`` is the field set the client's ETag was issued for.
+        """
         employee = await self.get_employee_by_id(employee_id, session)
         if not employee:
             raise EmployeeNotFound()
+        # The UPDATE itself is also conditional on this version, which closes the
+        # window between this check and the commit
+        if if_match:
+            check_if_match(if_match, await self.get_employee_etag(employee_id, session, fields))
         
         # Update fields
         for field, value in employee_data.model_dump(exclude_unset=True).items():
@@ -90,9 +461,7 @@ class EmployeeService:
 
     async def get_count(self, user_id: str, session: AsyncSession) -> dict:
         """Get total number of employees"""
-        result = await session.execute(select(Employee))
-        employees = result.scalars().all()
-        return {"count": len(list(employees))}
+        return {"count": await stats_service.get_counter("employees", session)}
 
     async def create_contract(self, contract_data: ContractCreate, user_id: str, session: AsyncSession) -> dict:
         """Create a new contract for an employee"""
@@ -118,7 +487,7 @@ class EmployeeService:
             return result_dict
 
         except Exception as e:
-            print(f"Error creating contract: {str(e)}")
+            logger.exception("Error creating contract")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create contract"
@@ -140,12 +509,40 @@ class EmployeeService:
             raise ContractNotFound()
         return contract
 
+    async def get_contract_detail(self, contract_id: int, session: AsyncSession) -> dict:
+        """Get a specific contract with the employee name"""
+        statement = self._contract_list_statement().where(Contract.id == contract_id)
+        result = await session.execute(statement)
+        row = result.first()
+        if not row:
+            raise ContractNotFound()
+        return self._contract_list_row(row)
+
+    async def get_contract_etag(self, contract_id: int, session: AsyncSession) -> Optional[str]:
+        """ETag of a contract response, covering the employee whose name it carries"""
+        statement = (
+            select(Contract.version, Employee.version)
+            .outerjoin(Employee, Contract.employee_id == Employee.id)
+            .where(Contract.id == contract_id)
+        )
+        result = await session.execute(statement)
+        row = result.first()
+        return make_etag(*row) if row else None
+
+    async def get_contracts_etag(self, session: AsyncSession) -> str:
+        """ETag of the contract list, from max(version) and count instead of the rows"""
+        statement = collection_version_statement(Contract, related=[Employee], counter="contracts")
+        result = await session.execute(statement)
+        return make_etag(*result.one())
+
     async def update_contract(
-        self, contract_id: int, contract_data: ContractUpdate, user_id: str, session: AsyncSession
+        self, contract_id: int, contract_data: ContractUpdate, user_id: str, session: AsyncSession,
+        if_match: Optional[str] = None
     ) -> Contract:
-        """Update a contract"""
+        """Update a contract, if it is still at the version named by If-Match"""
         contract = await self.get_contract_by_id(contract_id, session)
-        print("contract: ", contract)
+        if if_match:
+            check_if_match(if_match, await self.get_contract_etag(contract_id, session))
         # Update fields
         for field, value in contract_data.model_dump(exclude_unset=True).items():
             if field != 'employee_name':
@@ -170,21 +567,48 @@ class EmployeeService:
         await session.commit()
         return {"message": "Contract deleted successfully"}
     
-    async def get_all_contracts(self, session: AsyncSession) -> List[Contract]:
-        """Get all contracts"""
-        statement = (
+    def _contract_list_statement(self):
+        return (
             select(
                 Contract,
                 Employee.full_name.label('employee_name')
             )
             .outerjoin(Employee, Contract.employee_id == Employee.id)
         )
-        result = await session.execute(statement)
-        contracts = []
-        for contract, employee_name in result:
-            contract_dict = contract.__dict__
-            if '_sa_instance_state' in contract_dict:
-                del contract_dict['_sa_instance_state']
-            contract_dict['employee_name'] = employee_name or 'N/A'
-            contracts.append(contract_dict)
-        return contracts
+
+    @staticmethod
+    def _contract_list_row(row) -> dict:
+        contract, employee_name = row
+        contract_dict = contract.__dict__
+        if '_sa_instance_state' in contract_dict:
+            del contract_dict['_sa_instance_state']
+        contract_dict['employee_name'] = employee_name or 'N/A'
+        return contract_dict
+
+    def contract_stream_statement(self):
+        """Column-only contract listing for server-side cursor streaming"""
+        return (
+            select(
+                *Contract.__table__.columns,
+                Employee.full_name.label('employee_name'),
+            )
+            .outerjoin(Employee, Contract.employee_id == Employee.id)
+            .order_by(Contract.id)
+        )
+
+    @staticmethod
+    def contract_stream_row(row) -> dict:
+        contract_dict = dict(row._mapping)
+        contract_dict['employee_name'] = contract_dict['employee_name'] or 'N/A'
+        return contract_dict
+
+    async def get_contracts_page(self, params: PageParams, session: AsyncSession) -> dict:
+        """Get one keyset page of contracts"""
+        return await paginate(
+            session,
+            self._contract_list_statement(),
+            params,
+            id_column=Contract.id,
+            sort_columns={"id": Contract.id, "employee_id": Contract.employee_id},
+            row_to_item=self._contract_list_row,
+        )
@@ -3,7 +3,9 @@ from .auth_errors import (
     UserAlreadyExists, 
     UserNotFound, 
     InvalidToken,
-    RefreshTokenRequired
+    RefreshTokenRequired,
+    PasswordHashBusy,
+    LoginRateLimited
 )
 from .payroll_errors import PayrollNotFound
 from .attendance_errors import AttendanceNotFound
@@ -27,6 +29,8 @@ __all__ = [
     'UserNotFound',
     'InvalidToken',
     'RefreshTokenRequired',
+    'PasswordHashBusy',
+    'LoginRateLimited',
     'PayrollNotFound',
     'AttendanceNotFound',
     'EmployeeNotFound',
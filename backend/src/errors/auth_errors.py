@@ -16,4 +16,14 @@ class InvalidToken(Exception):
 
 class RefreshTokenRequired(Exception):
     """Raised when refresh token is required but not provided"""
-    pass 
\ No newline at end of file
+    pass
+
+class PasswordHashBusy(Exception):
+    """Raised when too many password hash operations are already queued"""
+    pass
+
+class LoginRateLimited(Exception):
+    """Raised when login attempts exceed the rate limit"""
+    def __init__(self, retry_after: int):
+        super().__init__(f"Retry after {retry_after}s")
+        self.retry_after = retry_after
@@ -0,0 +1,109 @@
+import atexit
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from config import settings
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Render each record as a single JSON line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _PreparedQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the arguments here; formatting happens on the writer thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def parse_level(name: str) -> Optional[int]:
+    """Resolve a level name such as ``"debug"``; None when it is not a level"""
+    value = logging.getLevelName(name.strip().upper())
+    # getLevelName returns "Level X" rather than raising for unknown names
+    return value if isinstance(value, int) else None
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """Parse ``"sqlalchemy.engine=WARNING,auth=DEBUG"`` into logger levels"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        value = parse_level(level)
+        if value is not None:
+            levels[name.strip()] = value
+    return levels
+
+
+def setup_logging() -> None:
+    """Send all records through a queue to a background writer thread"""
+    global _listener
+    if _listener is not None:
+        return
+
+    floor = logging.INFO if settings.ENVIRONMENT == "production" else logging.NOTSET
+
+    stream = logging.StreamHandler()
+    if settings.LOG_FORMAT == "json":
+        stream.setFormatter(JSONFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream, respect_handler_level=False)
+    _listener.start()
+    # Stopped at interpreter exit rather than in the lifespan, so records
+    # written during and after shutdown are still flushed
+    atexit.register(stop_logging)
+
+    root_level = parse_level(settings.LOG_LEVEL)
+    root = logging.getLogger()
+    root.handlers = [_PreparedQueueHandler(log_queue)]
+    root.setLevel(max(logging.INFO if root_level is None else root_level, floor))
+
+    # Route uvicorn's own loggers through the same queue
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    for name, level in parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(max(level, floor))
+
+    if root_level is None:
+        logging.getLogger(__name__).warning(f"Unknown LOG_LEVEL {settings.LOG_LEVEL!r}, using INFO")
+
+
+def stop_logging() -> None:
+    """Flush queued records; called at interpreter exit"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -2,28 +2,57 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from sqlalchemy.orm.exc import StaleDataError
+import logging
+
+from logging_config import setup_logging
+
+setup_logging()
 
 # Import routes
-from auth.routes import auth_router
+from auth.routes import auth_router, well_known_router
 from employee.routes import employee_router
 from department.routes import department_router
 from position.routes import position_router
 from education.routes import education_router
 from payroll.routes import payroll_router
 from attendance.routes import attendance_router
+from metrics.routes import metrics_router
+from media.routes import media_router
+from media.service import image_store
+from stats.routes import stats_router
+from stats.service import stats_reconciler
+from employee.importer import employee_importer
 
 # Import utilities and config
-from db.main import init_db
+from db.main import init_db, close_db
+from db.replica import close_read_db
+from auth.utils import close_password_hasher
+from auth.revocation import revocation_list
+from auth.user_cache import user_cache
 from middleware.middleware import register_middleware
 from config import settings
-from errors import register_all_errors, PayrollNotFound, AttendanceNotFound
+from errors import register_all_errors, PayrollNotFound, AttendanceNotFound, PasswordHashBusy, LoginRateLimited
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Starting up...")
+    logger.info("Starting up")
     await init_db()
+    revocation_list.start()
+    user_cache.start()
+    stats_reconciler.start()
     yield
-    print("Shutting down...")
+    logger.info("Shutting down")
+    await revocation_list.stop()
+    await user_cache.stop()
+    await stats_reconciler.stop()
+    await employee_importer.stop()
+    await close_db()
+    await close_read_db()
+    close_password_hasher()
+    image_store.close()
 
 version = "v1"
 
@@ -78,6 +107,14 @@ app.include_router(payroll_router, prefix=f"{version_prefix}/payroll", tags=["pa
 
 app.include_router(attendance_router, prefix=f"{version_prefix}/attendance", tags=["attendance"])
 
+app.include_router(stats_router, prefix=f"{version_prefix}/stats", tags=["stats"])
+
+app.include_router(metrics_router)
+
+app.include_router(media_router)
+
+app.include_router(well_known_router)
+
 @app.exception_handler(PayrollNotFound)
 async def payroll_not_found_handler(request: Request, exc: PayrollNotFound):
     return JSONResponse(
@@ -92,3 +129,26 @@ async def attendance_not_found_handler(request: Request, exc: AttendanceNotFound
         content={"message": "Attendance record not found"}
     )
 
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    # A concurrent write bumped the row's version between our read and our UPDATE
+    return JSONResponse(
+        status_code=412,
+        content={"message": "The record was changed by another request, reload it and retry"}
+    )
+
+@app.exception_handler(PasswordHashBusy)
+async def password_hash_busy_handler(request: Request, exc: PasswordHashBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"message": "Too many login attempts in progress, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(LoginRateLimited)
+async def login_rate_limited_handler(request: Request, exc: LoginRateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"message": "Too many login attempts, please try again later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
@@ -0,0 +1,98 @@
+"""
+Blocking image work. This module is imported by the image worker processes,
+so it depends on nothing but the standard library and Pillow.
+"""
+import hashlib
+import os
+from typing import BinaryIO, Iterable
+
+CHUNK_SIZE = 64 * 1024
+DIGEST_SIZE = 16  # bytes; names stay within Employee.profile_image_path's 40 characters
+
+# Pillow format -> stored file extension
+FORMATS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif"}
+
+# Reject images that would decode to more pixels than this (about 8k x 5k)
+MAX_PIXELS = 40_000_000
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+class ImageTooLarge(InvalidImage):
+    pass
+
+
+def spool(source: BinaryIO, target: BinaryIO, max_bytes: int) -> str:
+    """Copy an upload in chunks, returning the hex digest of its content"""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    size = 0
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise ImageTooLarge(f"Image is larger than {max_bytes} bytes")
+        digest.update(chunk)
+        target.write(chunk)
+    if size == 0:
+        raise InvalidImage("Image is empty")
+    return digest.hexdigest()
+
+
+def original_path(media_dir: str, name: str) -> str:
+    return os.path.join(media_dir, "originals", name)
+
+
+def thumbnail_path(media_dir: str, size: int, digest: str) -> str:
+    return os.path.join(media_dir, "thumbs", str(size), f"{digest}.jpg")
+
+
+def _replace(temp_path: str, final_path: str) -> None:
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(temp_path, final_path)
+
+
+def process_image(path: str, media_dir: str, digest: str, sizes: Iterable[int]) -> str:
+    """
+    Check that the spooled upload is an image, write its square JPEG
+    thumbnails and move it to its content-addressed name, which is returned.
+    Content that was stored before is not processed again.
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+    try:
+        with Image.open(path) as image:
+            extension = FORMATS.get(image.format)
+            if extension is None:
+                raise InvalidImage("Upload a JPEG, PNG, WEBP or GIF image")
+            if image.width * image.height > MAX_PIXELS:
+                raise InvalidImage("Image dimensions are too large")
+            name = f"{digest}.{extension}"
+            target = original_path(media_dir, name)
+            if os.path.exists(target):
+                os.remove(path)
+                return name
+
+            image.load()
+            # Phones store rotation in EXIF rather than in the pixels
+            upright = ImageOps.exif_transpose(image).convert("RGB")
+    except InvalidImage:
+        raise
+    except Exception:
+        raise InvalidImage("Not a readable image")
+
+    for size in sizes:
+        thumbnail = ImageOps.fit(upright, (size, size), Image.LANCZOS)
+        final_path = thumbnail_path(media_dir, size, digest)
+        temp_path = f"{final_path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        thumbnail.save(temp_path, "JPEG", quality=85, optimize=True, progressive=True)
+        _replace(temp_path, final_path)
+
+    # The original goes last, so its presence means the thumbnails exist too
+    _replace(path, target)
+    return name
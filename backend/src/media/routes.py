@@ -0,0 +1,36 @@
+import mimetypes
+import os
+import re
+
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import FileResponse
+
+from config import settings
+
+media_router = APIRouter()
+
+# Stored names are content hashes, so a URL always refers to the same bytes
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_MEDIA_PATH = re.compile(r"originals/[0-9a-f]{32}\.(?:jpg|png|webp|gif)|thumbs/\d{1,4}/[0-9a-f]{32}\.jpg")
+
+
+@media_router.get("/media/{path:path}", include_in_schema=False)
+async def get_media(path: str) -> Response:
+    """
+    Serve a stored image. With MEDIA_ACCEL_REDIRECT set, nginx sends the file
+    itself (with sendfile); otherwise FileResponse streams it, Range included.
+    """
+    if not _MEDIA_PATH.fullmatch(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    headers = {"Cache-Control": IMMUTABLE}
+    media_type = mimetypes.guess_type(path)[0]
+    if settings.MEDIA_ACCEL_REDIRECT:
+        headers["X-Accel-Redirect"] = f"{settings.MEDIA_ACCEL_REDIRECT.rstrip('/')}/{path}"
+        return Response(headers=headers, media_type=media_type)
+
+    file_path = os.path.join(settings.MEDIA_DIR, path)
+    if not os.path.isfile(file_path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return FileResponse(file_path, headers=headers, media_type=media_type)
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+from media.processing import ImageTooLarge, InvalidImage, process_image, spool
+from metrics import IMAGE_PROCESSING_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+def thumbnail_sizes() -> List[int]:
+    return sorted({int(size) for size in settings.IMAGE_THUMBNAIL_SIZES.split(",") if size.strip()})
+
+
+class ImageStore:
+    """
+    Keeps uploaded images under content-addressed names in MEDIA_DIR, so a
+    stored file never changes and can be cached forever. Decoding and resizing
+    run in worker processes, off the event loop and the serving process's GIL.
+    """
+
+    def __init__(self, media_dir: str = None, sizes: List[int] = None, workers: int = None):
+        self.media_dir = media_dir or settings.MEDIA_DIR
+        self.sizes = sizes or thumbnail_sizes()
+        self.workers = workers or settings.IMAGE_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned rather than forked, since this process runs logging and pool threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def save(self, upload: UploadFile) -> str:
+        """Store an uploaded image and its thumbnails, returning the stored name"""
+        if upload.size is not None and upload.size > settings.IMAGE_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Image is larger than {settings.IMAGE_MAX_BYTES} bytes"
+            )
+
+        # Spool next to the final location so it can be renamed into place
+        spool_dir = os.path.join(self.media_dir, "tmp")
+        os.makedirs(spool_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="upload-", dir=spool_dir)
+        started = time.perf_counter()
+        result = "invalid"
+        try:
+            with os.fdopen(fd, "wb") as spooled:
+                digest = await run_in_threadpool(spool, upload.file, spooled, settings.IMAGE_MAX_BYTES)
+            loop = asyncio.get_running_loop()
+            name = await loop.run_in_executor(
+                self._pool(), process_image, path, self.media_dir, digest, self.sizes
+            )
+            result = "stored"
+            return name
+        except ImageTooLarge as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        except InvalidImage as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        finally:
+            IMAGE_PROCESSING_DURATION.observe(result, value=time.perf_counter() - started)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def urls(self, name: str) -> dict:
+        """Public URLs of a stored image and its thumbnails"""
+        digest = name.split(".")[0]
+        base = settings.MEDIA_URL.rstrip("/")
+        return {
+            "original_url": f"{base}/originals/{name}",
+            "thumbnail_urls": {str(size): f"{base}/thumbs/{size}/{digest}.jpg" for size in self.sizes},
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+image_store = ImageStore()
@@ -0,0 +1,36 @@
+from .registry import REGISTRY, Counter, Gauge, Histogram
+from .metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    REDIS_COMMAND_DURATION,
+    LOGIN_ATTEMPTS,
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_QUEUE_WAIT,
+    REVOCATION_CHECKS,
+    USER_CACHE_REQUESTS,
+    RATE_LIMIT_HITS,
+    STATS_COUNTER_DRIFT,
+    IMAGE_PROCESSING_DURATION,
+    observe_duration,
+)
+
+__all__ = [
+    'REGISTRY',
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'HTTP_REQUEST_DURATION',
+    'HTTP_REQUESTS_IN_FLIGHT',
+    'REDIS_COMMAND_DURATION',
+    'LOGIN_ATTEMPTS',
+    'PASSWORD_HASH_DURATION',
+    'PASSWORD_HASH_QUEUE_DEPTH',
+    'PASSWORD_HASH_QUEUE_WAIT',
+    'REVOCATION_CHECKS',
+    'USER_CACHE_REQUESTS',
+    'RATE_LIMIT_HITS',
+    'STATS_COUNTER_DRIFT',
+    'IMAGE_PROCESSING_DURATION',
+    'observe_duration',
+]
@@ -0,0 +1,112 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from metrics.registry import REGISTRY
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+)
+
+DB_POOL_CONNECTIONS = REGISTRY.gauge(
+    "db_pool_connections",
+    "Database pool connections by state",
+    ["engine", "state"],
+)
+DB_POOL_WAIT_SECONDS = REGISTRY.gauge(
+    "db_pool_wait_seconds",
+    "Total time spent waiting for a pooled connection",
+    ["engine"],
+)
+DB_POOL_WAIT_MAX_SECONDS = REGISTRY.gauge(
+    "db_pool_wait_max_seconds",
+    "Longest wait for a pooled connection",
+    ["engine"],
+)
+
+REDIS_COMMAND_DURATION = REGISTRY.histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency",
+    ["command"],
+)
+
+LOGIN_ATTEMPTS = REGISTRY.counter(
+    "auth_login_attempts_total",
+    "Login attempts by result",
+    ["result"],
+)
+PASSWORD_HASH_DURATION = REGISTRY.histogram(
+    "auth_password_hash_seconds",
+    "Time spent hashing or verifying passwords",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+PASSWORD_HASH_QUEUE_DEPTH = REGISTRY.gauge(
+    "auth_password_hash_pending",
+    "Password hash operations queued or running on the hashing pool",
+)
+PASSWORD_HASH_QUEUE_WAIT = REGISTRY.histogram(
+    "auth_password_hash_queue_wait_seconds",
+    "Time a password hash operation waited for a free worker",
+)
+REVOCATION_CHECKS = REGISTRY.counter(
+    "auth_revocation_checks_total",
+    "Token revocation checks by outcome",
+    ["result"],
+)
+USER_CACHE_REQUESTS = REGISTRY.counter(
+    "auth_user_cache_requests_total",
+    "Authenticated user lookups by cache result",
+    ["result"],
+)
+RATE_LIMIT_HITS = REGISTRY.counter(
+    "auth_login_rate_limited_total",
+    "Login attempts rejected by the rate limiter",
+    ["scope"],
+)
+STATS_COUNTER_DRIFT = REGISTRY.counter(
+    "stats_counter_drift_total",
+    "Dashboard counters corrected by reconciliation",
+)
+IMAGE_PROCESSING_DURATION = REGISTRY.histogram(
+    "media_image_processing_seconds",
+    "Time spent validating and resizing uploaded images, including the wait for a worker",
+    ["result"],
+)
+
+
+@contextmanager
+def observe_duration(histogram, *labels: str) -> Iterator[None]:
+    """Record the wall time of the enclosed block on a monotonic clock"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(*labels, value=time.perf_counter() - start)
+
+
+def collect_pool_stats() -> None:
+    # Imported here so the metrics package does not create engines on import
+    from db.main import async_engine, get_pool_stats
+    from db.replica import read_engine
+
+    engines = {"primary": async_engine}
+    if read_engine is not None:
+        engines["replica"] = read_engine
+
+    for name, engine in engines.items():
+        stats = get_pool_stats(engine)
+        for state in ("size", "checked_in", "checked_out", "overflow"):
+            DB_POOL_CONNECTIONS.set(name, state, value=stats[state])
+        DB_POOL_WAIT_SECONDS.set(name, value=stats["wait_time_total"])
+        DB_POOL_WAIT_MAX_SECONDS.set(name, value=stats["wait_time_max"])
+
+
+REGISTRY.add_collector(collect_pool_stats)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from metrics.registry import REGISTRY
+
+metrics_router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Expose application metrics in the Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
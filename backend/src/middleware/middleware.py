@@ -1,21 +1,107 @@
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import time
 import logging
+from typing import AsyncIterator
+
+from config import settings
+from db.instrumentation import QueryStats, track_queries
+from db.replica import mark_primary_sticky
+from metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
 
 logger = logging.getLogger(__name__)
 
+def _log_repeated_queries(request: Request, stats: QueryStats) -> None:
+    if logger.isEnabledFor(logging.DEBUG):
+        for shape, count in stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+            logger.debug(
+                f"Possible N+1 in {request.method} {request.url.path}: "
+                f"{count}x {' '.join(shape.split())[:200]}"
+            )
+
+def _budget_message(request: Request, stats: QueryStats) -> str:
+    return f"{request.method} {request.url.path} issued {stats.count} queries, budget is {stats.budget}"
+
+def check_queries(request: Request, response: Response, stats: QueryStats, elapsed: float) -> Response:
+    """Report the request's SQL statements and enforce its query budget"""
+    if settings.SERVER_TIMING:
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+            f'app;dur={elapsed * 1000:.2f}'
+        )
+
+    _log_repeated_queries(request, stats)
+
+    if stats.over_budget:
+        message = _budget_message(request, stats)
+        if settings.DB_QUERY_BUDGET_STRICT:
+            logger.error(message)
+            return JSONResponse(
+                content={
+                    "message": message,
+                    "error_code": "query_budget_exceeded",
+                },
+                status_code=500,
+            )
+        logger.warning(message)
+
+    return response
+
+async def check_streamed_queries(request: Request, body: AsyncIterator[bytes], stats: QueryStats):
+    """
+    Pass a streamed body through and check its statements once it has been
+    sent. Its queries run while it streams, after the headers have gone out,
+    so it gets no Server-Timing header and strict mode can only log.
+    """
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        _log_repeated_queries(request, stats)
+        if stats.over_budget:
+            message = _budget_message(request, stats)
+            if settings.DB_QUERY_BUDGET_STRICT:
+                logger.error(message)
+            else:
+                logger.warning(message)
+
+def route_template(request: Request) -> str:
+    """Path template of the matched route, so ids do not explode the label set"""
+    route = request.scope.get("route")
+    return getattr(route, "path", "<unmatched>")
+
 async def request_middleware(request: Request, call_next):
-    """Log request timing and details"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    
-    logger.info(
-        f"Method: {request.method} Path: {request.url.path} "
-        f"Status: {response.status_code} Time: {process_time:.2f}s"
-    )
-    
+    """Record request metrics and SQL statistics"""
+    method = request.method
+    status_code = 500
+    HTTP_REQUESTS_IN_FLIGHT.inc(method)
+    start_time = time.perf_counter()
+    try:
+        with track_queries(settings.DB_QUERY_BUDGET) as stats:
+            response = await call_next(request)
+            if "content-length" in response.headers:
+                response = check_queries(request, response, stats, time.perf_counter() - start_time)
+            else:
+                # A body without a length is still being produced, queries included;
+                # the app task keeps recording into the same stats while it streams
+                response.body_iterator = check_streamed_queries(request, response.body_iterator, stats)
+        status_code = response.status_code
+    finally:
+        process_time = time.perf_counter() - start_time
+        HTTP_REQUESTS_IN_FLIGHT.dec(method)
+        HTTP_REQUEST_DURATION.observe(
+            method, route_template(request), str(status_code), value=process_time
+        )
+
+    mark_primary_sticky(request, response)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Method: {method} Path: {request.url.path} "
+            f"Status: {status_code} Time: {process_time:.3f}s"
+        )
+
     return response
 
 def register_middleware(app: FastAPI):
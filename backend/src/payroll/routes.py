@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Literal, Optional
 
 from db.main import get_session
+from db.replica import get_read_session, get_read_session_factory
+from db.streaming import streaming_response
+from db.pagination import Page, PageParams
+from db.versioning import not_modified
 from auth.dependencies import AccessTokenBearer, RoleChecker
 from payroll.schemas import PayrollCreate, PayrollUpdate, PayrollResponse
 from payroll.service import PayrollService
@@ -24,30 +31,58 @@ async def create_payroll(
     return PayrollResponse(**payroll_dict)
 
 
-@payroll_router.get("/", response_model=List[PayrollResponse], dependencies=[role_checker])
+@payroll_router.get("/", response_model=Page[PayrollResponse], dependencies=[role_checker])
 async def get_all_payrolls(
-    session: AsyncSession = Depends(get_session),
+    response: Response,
+    params: PageParams = Depends(),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
     token_details: dict = Depends(access_token_bearer),
 ):
-    """Get all payroll records"""
-    try:
-        user_id = token_details.get("user")["uid"]
-        return await payroll_service.get_all_payrolls(session, user_id)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    """Get one page of payroll records"""
+    etag = await payroll_service.get_payrolls_etag(session)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+
+    response.headers["ETag"] = etag
+    return await payroll_service.get_payrolls_page(params, session)
+
+@payroll_router.get("/export", response_class=StreamingResponse, dependencies=[role_checker])
+async def export_payrolls(
+    format: Literal["json", "ndjson", "csv", "xlsx"] = Query("json"),
+    gzip: bool = Query(False, description="Compress the response with Content-Encoding: gzip"),
+    factory: async_sessionmaker = Depends(get_read_session_factory),
+    token_details: dict = Depends(access_token_bearer),
+) -> StreamingResponse:
+    """Stream all payroll records with employee names and net salary"""
+    return streaming_response(
+        factory,
+        payroll_service.payroll_stream_statement(),
+        payroll_service.payroll_stream_row,
+        format,
+        filename="payroll",
+        gzip=gzip,
+    )
 
 @payroll_router.get("/{payroll_id}", response_model=PayrollResponse, dependencies=[role_checker])
 async def get_payroll(
     payroll_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
     token_details: dict = Depends(access_token_bearer),
 ):
-    """Get a specific payroll record"""
+    """Get a specific payroll record; answers 304 when If-None-Match names the current version"""
+    etag = await payroll_service.get_payroll_etag(payroll_id, session)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+
     try:
-        return await payroll_service.get_payroll_by_id(payroll_id, session)
+        payroll = await payroll_service.get_payroll_by_id(payroll_id, session)
+        response.headers["ETag"] = etag
+        return payroll
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -58,13 +93,19 @@ async def get_payroll(
 async def update_payroll(
     payroll_id: int,
     payroll_data: PayrollUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag the update is based on; 412 if it is stale"),
     session: AsyncSession = Depends(get_session),
     token_details: dict = Depends(access_token_bearer),
 ):
     """Update a payroll record"""
     try:
         user_id = token_details.get("user")["uid"]
-        return await payroll_service.update_payroll(payroll_id, payroll_data, user_id, session)
+        payroll = await payroll_service.update_payroll(payroll_id, payroll_data, user_id, session, if_match)
+        response.headers["ETag"] = await payroll_service.get_payroll_etag(payroll_id, session)
+        return payroll
+    except (HTTPException, StaleDataError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,13 +1,18 @@
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List
+from typing import Optional
 from datetime import datetime
+import logging
 from fastapi import HTTPException, status
 
 from db.models import Payroll, Employee
+from db.pagination import PageParams, paginate
+from db.versioning import check_if_match, collection_version_statement, make_etag
 from payroll.schemas import PayrollCreate, PayrollUpdate
 from errors import PayrollNotFound, EmployeeNotFound
 
+logger = logging.getLogger(__name__)
+
 class PayrollService:
     async def create_payroll(self, payroll_data: PayrollCreate, user_id: str, session: AsyncSession) -> Payroll:
         """Create a new payroll record"""
@@ -34,41 +39,75 @@ class PayrollService:
             return result_dict
 
         except Exception as e:
-            print(f"Error creating payroll: {str(e)}")
+            logger.exception("Error creating payroll")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create payroll record"
             )
 
-    async def get_all_payrolls(self, session: AsyncSession, user_id: str) -> List[dict]:
-        """Get all payroll records with employee names"""
-        try:
-            statement = (
-                select(
-                    Payroll,
-                    Employee.full_name.label('employee_name')
-                )
-                .join(Employee, Payroll.employee_id == Employee.id)
+    def _payroll_list_statement(self):
+        return (
+            select(
+                Payroll,
+                Employee.full_name.label('employee_name')
             )
+            .join(Employee, Payroll.employee_id == Employee.id)
+        )
 
-            print("statement: ", statement)
-            
-            result = await session.execute(statement)
-            payrolls = []
-            for payroll, employee_name in result:
-                payroll_dict = payroll.__dict__
-                if '_sa_instance_state' in payroll_dict:
-                    del payroll_dict['_sa_instance_state']
-                payroll_dict['employee_name'] = employee_name or 'N/A'
-                payroll_dict['net_salary'] = payroll_dict['base_salary'] + payroll_dict['allowance'] - payroll_dict['deduction']
-                payrolls.append(payroll_dict)
-            return payrolls
-        except Exception as e:
-            print(f"Error getting payrolls: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch payroll records"
+    @staticmethod
+    def _payroll_list_row(row) -> dict:
+        payroll, employee_name = row
+        payroll_dict = payroll.__dict__
+        if '_sa_instance_state' in payroll_dict:
+            del payroll_dict['_sa_instance_state']
+        payroll_dict['employee_name'] = employee_name or 'N/A'
+        payroll_dict['net_salary'] = payroll_dict['base_salary'] + payroll_dict['allowance'] - payroll_dict['deduction']
+        return payroll_dict
+
+    def payroll_stream_statement(self):
+        """Column-only payroll listing for server-side cursor streaming"""
+        return (
+            select(
+                *Payroll.__table__.columns,
+                Employee.full_name.label('employee_name'),
             )
+            .join(Employee, Payroll.employee_id == Employee.id)
+            .order_by(Payroll.id)
+        )
+
+    @staticmethod
+    def payroll_stream_row(row) -> dict:
+        payroll_dict = dict(row._mapping)
+        payroll_dict['employee_name'] = payroll_dict['employee_name'] or 'N/A'
+        payroll_dict['net_salary'] = payroll_dict['base_salary'] + payroll_dict['allowance'] - payroll_dict['deduction']
+        return payroll_dict
+
+    async def get_payrolls_page(self, params: PageParams, session: AsyncSession) -> dict:
+        """Get one keyset page of payroll records with employee names"""
+        return await paginate(
+            session,
+            self._payroll_list_statement(),
+            params,
+            id_column=Payroll.id,
+            sort_columns={"id": Payroll.id, "employee_id": Payroll.employee_id},
+            row_to_item=self._payroll_list_row,
+        )
+
+    async def get_payrolls_etag(self, session: AsyncSession) -> str:
+        """ETag of the payroll list, from max(version) and count instead of the rows"""
+        result = await session.execute(collection_version_statement(Payroll, related=[Employee]))
+        return make_etag(*result.one())
+
+    async def get_payroll_etag(self, payroll_id: int, session: AsyncSession) -> Optional[str]:
+        """ETag of a payroll response, covering the employee whose name it carries"""
+        statement = (
+            select(Payroll.version, Employee.version)
+            .outerjoin(Employee, Payroll.employee_id == Employee.id)
+            .where(Payroll.id == payroll_id)
+        )
+        result = await session.execute(statement)
+        row = result.first()
+        return make_etag(*row) if row else None
 
     async def get_payroll_by_id(self, payroll_id: int, session: AsyncSession) -> Payroll:
         """Get a specific payroll record"""
@@ -87,11 +126,16 @@ class PayrollService:
         payroll_dict['net_salary'] = payroll_dict['base_salary'] + payroll_dict['allowance'] - payroll_dict['deduction']
         return payroll_dict
 
-    async def update_payroll(self, payroll_id: int, payroll_data: PayrollUpdate, user_id: str, session: AsyncSession) -> Payroll:
-        """Update a payroll record"""
+    async def update_payroll(
+        self, payroll_id: int, payroll_data: PayrollUpdate, user_id: str, session: AsyncSession,
+        if_match: Optional[str] = None
+    ) -> Payroll:
+        """Update a payroll record, if it is still at the version named by If-Match"""
         payroll = await session.get(Payroll, payroll_id)
         if not payroll:
             raise PayrollNotFound()
+        if if_match:
+            check_if_match(if_match, await self.get_payroll_etag(payroll_id, session))
         
         # Update fields
         for field, value in payroll_data.model_dump(exclude_unset=True).items():
@@ -3,6 +3,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
 from db.main import get_session
+from db.replica import get_read_session
 from position.schemas import PositionCreate, PositionRead, PositionUpdate
 from position.service import PositionService
 from errors import PositionNotFound, PositionAlreadyExists
@@ -28,7 +29,7 @@ async def create_position(
 
 @position_router.get("/", response_model=List[PositionRead])
 async def get_all_positions(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     _: dict = Depends(access_token_bearer)
 ):
     return await position_service.get_all_positions(session)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db.replica import get_read_session
+from stats.schemas import StatsSummary
+from stats.service import StatsService
+from auth.dependencies import AccessTokenBearer, RoleChecker
+
+stats_router = APIRouter()
+stats_service = StatsService()
+access_token_bearer = AccessTokenBearer()
+role_checker = Depends(RoleChecker(["admin", "user"]))
+
+@stats_router.get("/summary", response_model=StatsSummary, dependencies=[role_checker])
+async def get_summary(
+    session: AsyncSession = Depends(get_read_session),
+    _: dict = Depends(access_token_bearer),
+) -> dict:
+    """Headcount, department and contract counts for the dashboard"""
+    return await stats_service.get_summary(session)
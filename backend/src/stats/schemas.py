@@ -0,0 +1,14 @@
+from typing import Dict
+from pydantic import BaseModel
+
+class HeadcountSummary(BaseModel):
+    total: int
+    by_department: Dict[str, int]
+    by_position: Dict[str, int]
+    by_gender: Dict[str, int]
+    by_marital_status: Dict[str, int]
+
+class StatsSummary(BaseModel):
+    employees: HeadcountSummary
+    departments: int
+    contracts: int
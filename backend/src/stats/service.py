@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config import settings
+from db.main import async_engine
+from db.counters import EMPLOYEE_BREAKDOWNS, TABLE_TOTALS, TOTAL_KEY, reconcile
+from db.models import StatCounter
+from metrics import STATS_COUNTER_DRIFT
+
+logger = logging.getLogger(__name__)
+
+
+class StatsService:
+    async def get_counter(self, metric: str, session: AsyncSession) -> int:
+        """Read one total from the counters table"""
+        statement = select(StatCounter.value).where(StatCounter.metric == metric, StatCounter.key == TOTAL_KEY)
+        result = await session.execute(statement)
+        return result.scalar_one_or_none() or 0
+
+    async def get_summary(self, session: AsyncSession) -> dict:
+        """Dashboard counts from one read of the counters table"""
+        result = await session.execute(select(StatCounter.metric, StatCounter.key, StatCounter.value))
+        counters = {}
+        for metric, key, value in result:
+            if value:
+                counters.setdefault(metric, {})[key] = value
+
+        totals = {metric: counters.get(metric, {}).get(TOTAL_KEY, 0) for metric in TABLE_TOTALS}
+        headcount = {
+            metric[len("employees_"):]: counters.get(metric, {})
+            for metric in EMPLOYEE_BREAKDOWNS
+        }
+        return {
+            "employees": {"total": totals["employees"], **headcount},
+            "departments": totals["departments"],
+            "contracts": totals["contracts"],
+        }
+
+
+class StatsReconciler:
+    """
+    Periodically recounts the tables behind the counters. Writes through the
+    ORM keep the counters exact; this corrects anything that bypassed it,
+    such as bulk loads or manual SQL.
+    """
+
+    def __init__(self, engine: AsyncEngine = None):
+        self.engine = engine or async_engine
+        self._task: Optional[asyncio.Task] = None
+
+    async def reconcile(self) -> int:
+        """Recount now and return the number of corrected counters"""
+        async with self.engine.begin() as conn:
+            drifted = await conn.run_sync(reconcile)
+        if drifted:
+            STATS_COUNTER_DRIFT.inc(amount=drifted)
+            logger.warning(f"Corrected {drifted} drifted stat counters")
+        return drifted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Stat counter reconciliation failed: {str(e)}")
+            await asyncio.sleep(settings.STATS_RECONCILE_INTERVAL)
+
+    def start(self) -> None:
+        """Reconcile on startup and then every STATS_RECONCILE_INTERVAL seconds"""
+        if self._task is None and settings.STATS_RECONCILE_INTERVAL > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+stats_reconciler = StatsReconciler()
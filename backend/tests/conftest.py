@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read at import time, so the environment is set before the app is imported
+_db_dir = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_db_dir, 'test.sqlite3')}"
+os.environ.setdefault("JWT_SECRET", "test-secret-" + "x" * 32)
+os.environ.setdefault("REDIS_URL", "redis://localhost:1")  # unreachable; Redis-backed features degrade
+os.environ["LOGIN_RATE_LIMIT_ENABLED"] = "false"
+os.environ["DB_QUERY_BUDGET_STRICT"] = "true"  # routes over their QueryBudget fail the test
+os.environ["LOG_FORMAT"] = "text"
+os.environ["LOG_LEVEL"] = "WARNING"
+os.environ["MEDIA_DIR"] = os.path.join(_db_dir, "uploads")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from auth.utils import create_access_token  # noqa: E402
+from datagen import DatasetConfig, generate  # noqa: E402
+from db.main import async_engine  # noqa: E402
+from main import app  # noqa: E402
+
+PREFIX = "/api/v1"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        # The lifespan has created the tables by now
+        client.portal.call(generate, async_engine, DatasetConfig(
+            employees=5, users=1, departments=2, positions=2,
+            payroll_months=0, workpoint_days=0, attendance_days=0,
+        ))
+        yield client
+
+
+def auth_headers(role: str = "admin") -> dict:
+    token = create_access_token(user_data={"username": f"test-{role}", "uid": f"test-{role}", "role": role})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,41 @@
+from conftest import PREFIX, auth_headers
+
+
+def test_patch_accepts_etag_from_get(client):
+    headers = auth_headers()
+    response = client.get(f"{PREFIX}/employee/1", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.patch(
+        f"{PREFIX}/employee/1", json={"full_name": "Nguyễn Văn A"}, headers={**headers, "If-Match": etag}
+    )
+    assert response.status_code == 200
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    # The returned ETag is the one a GET now serves
+    response = client.get(f"{PREFIX}/employee/1", headers={**headers, "If-None-Match": new_etag})
+    assert response.status_code == 304
+
+
+def test_patch_with_stale_etag_is_rejected(client):
+    headers = auth_headers()
+    etag = client.get(f"{PREFIX}/employee/2", headers=headers).headers["ETag"]
+    client.patch(f"{PREFIX}/employee/2", json={"full_name": "Trần Thị B"}, headers=headers)
+
+    response = client.patch(
+        f"{PREFIX}/employee/2", json={"full_name": "Lê Văn C"}, headers={**headers, "If-Match": etag}
+    )
+    assert response.status_code == 412
+
+
+def test_patch_matches_etag_of_same_fields(client):
+    headers = auth_headers()
+    etag = client.get(f"{PREFIX}/employee/3?fields=full_name", headers=headers).headers["ETag"]
+
+    response = client.patch(
+        f"{PREFIX}/employee/3?fields=full_name", json={"phone": "0901234567"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 200
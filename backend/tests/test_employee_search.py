@@ -0,0 +1,25 @@
+from conftest import PREFIX, auth_headers
+
+
+def _search(client, q: str, role: str) -> list:
+    response = client.get(f"{PREFIX}/employee/search", params={"q": q}, headers=auth_headers(role))
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()["items"]]
+
+
+def _employee(client, employee_id: int, fields: str) -> dict:
+    return client.get(f"{PREFIX}/employee/{employee_id}?fields={fields}", headers=auth_headers()).json()
+
+
+def test_id_number_search_is_admin_only(client):
+    id_number = _employee(client, 4, "id_number")["id_number"]
+
+    assert _search(client, id_number, "admin")[0] == 4
+    assert 4 not in _search(client, id_number, "user")
+
+
+def test_user_search_by_name_and_code(client):
+    employee = _employee(client, 5, "full_name,employee_code")
+
+    assert 5 in _search(client, employee["full_name"], "user")
+    assert _search(client, employee["employee_code"], "user")[0] == 5
@@ -0,0 +1,25 @@
+import logging
+
+from conftest import PREFIX, auth_headers
+from config import settings
+
+
+def test_buffered_response_reports_queries(client):
+    response = client.get(f"{PREFIX}/employee/1", headers=auth_headers())
+    assert response.status_code == 200
+    # The ETag lookup and the row itself, within the route's QueryBudget(2)
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+
+
+def test_streamed_response_is_checked_after_its_body(client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 1)
+    caplog.set_level(logging.DEBUG, logger="middleware.middleware")
+
+    response = client.get(f"{PREFIX}/employee/export?format=ndjson", headers=auth_headers())
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 5
+    # Headers go out before the export queries run, so no count is claimed for them
+    assert "Server-Timing" not in response.headers
+
+    logged = [r.getMessage() for r in caplog.records if "/employee/export" in r.getMessage()]
+    assert any("1x SELECT" in message for message in logged)
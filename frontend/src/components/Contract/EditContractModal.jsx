@@ -33,7 +33,7 @@ export function EditContractModal({ isOpen, onClose, onSubmit, contract }) {
 
   const fetchEmployees = async () => {
     try {
-      const response = await api.get('/employee/');
+      const response = await api.get('/employee/export');
       setEmployees(response.data);
     } catch (error) {
       console.error('Error fetching employees:', error);
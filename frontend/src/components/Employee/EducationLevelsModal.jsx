@@ -21,7 +21,7 @@ export function EducationLevelsModal({ isOpen, onClose, employeeId }) {
   const fetchEducationLevels = async () => {
     try {
       setIsLoading(true)
-      const response = await api.get(employeeId ? `/education/${employeeId}` : '/education')
+      const response = await api.get(employeeId ? `/education/${employeeId}` : '/education/export')
       setEducationLevels(response.data)
     } catch (error) {
       console.error('Error fetching education levels:', error)
@@ -24,7 +24,7 @@ export function CreatePayrollModal({ isOpen, onClose, onSuccess }) {
 
   const fetchEmployees = async () => {
     try {
-      const response = await api.get('/employee/');
+      const response = await api.get('/employee/export');
       setEmployees(response.data);
     } catch (error) {
       console.error('Error fetching employees:', error);
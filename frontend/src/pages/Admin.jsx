@@ -20,7 +20,7 @@ export default function Admin() {
   const fetchAccounts = async () => {
     try {
       setIsLoading(true);
-      const response = await api.get('/auth/users/');
+      const response = await api.get('/auth/users/export');
       setAccounts(response.data);
     } catch (error) {
       console.error('Error fetching accounts:', error);
@@ -20,7 +20,7 @@ function Attendance() {
 
   const fetchEmployees = async () => {
     try {
-      const response = await api.get('/employee/');
+      const response = await api.get('/employee/export');
       setEmployees(response.data);
     } catch (error) {
       console.error('Error fetching employees:', error);
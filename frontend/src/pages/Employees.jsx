@@ -36,7 +36,7 @@ function Employees() {
     try {
       setIsLoading(true)
       setError(null)
-      const response = await api.get('/employee/')
+      const response = await api.get('/employee/export')
       console.log('Employee data:', response.data)
       
       if (!response.data) {
@@ -24,7 +24,7 @@ function Payroll() {
     try {
       setIsLoading(true);
       setError(null);
-      const response = await api.get('/payroll/');
+      const response = await api.get('/payroll/export');
       setPayrolls(response.data);
     } catch (error) {
       console.error('Error fetching payrolls:', error);
@@ -13,7 +13,9 @@ export const AuthService = {
 
     async logout() {
         try {
-            await api.post('/auth/logout');
+            await api.post('/auth/logout', {
+                refresh_token: localStorage.getItem('refreshToken')
+            });
         } finally {
             this.clearTokens();
         }
@@ -2,7 +2,7 @@ import api from './axios';
 
 const getContracts = async () => {
   try {
-    const response = await api.get('/employee/contracts/');
+    const response = await api.get('/employee/contracts/export');
     return response.data;
   } catch (error) {
     throw error.response?.data || error.message;